@@ -1,23 +1,169 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import List, Dict, Any
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
+from typing import AsyncIterator, List, Dict, Any, Optional
 import logging
 from datetime import datetime
-
+import orjson
+import redis.asyncio as aioredis
+
+from src.batcher import (
+    DynamicBatcher,
+    analyze_texts_in_worker,
+    init_inference_worker,
+    ping_inference_worker,
+)
 from src.data_collector import NewsCollector
 from src.sentiment_analyzer import SentimentAnalyzer
 from src.stock_scorer import StockScorer
 from src.utils import ensure_directories, format_ticker, validate_ticker
 
+try:
+    from src.tasks import analyze_task, celery_app
+except ImportError:  # pragma: no cover - optional dependency
+    analyze_task = celery_app = None
+
 # Setup
 ensure_directories()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Initialize components (singleton pattern)
+# FinBERT is loaded in the inference worker processes, not in the API process
+collector = NewsCollector()
+scorer = StockScorer()
+inference_workers = int(os.getenv("INFERENCE_WORKERS", "1"))
+
+
+def create_inference_pool() -> ProcessPoolExecutor:
+    """Create the inference worker pool (processes start on first use)"""
+    return ProcessPoolExecutor(
+        max_workers=inference_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_inference_worker,
+    )
+
+
+# The batcher owns the pool and replaces it if it breaks, e.g. when a worker dies
+batcher = DynamicBatcher(analyze_texts_in_worker, executor_factory=create_inference_pool)
+
+# Optional Redis cache for analysis reports (disabled when REDIS_URL is not set)
+redis_url = os.getenv("REDIS_URL")
+redis_client = aioredis.from_url(redis_url, decode_responses=True) if redis_url else None
+analysis_cache_ttl = int(os.getenv("ANALYSIS_CACHE_TTL", "900"))
+cache_stats = {"hits": 0, "misses": 0, "errors": 0}
+
+# A ping waits behind running batches, so allow more than one forward pass
+health_check_timeout = float(os.getenv("HEALTH_CHECK_TIMEOUT", "10"))
+
+
+async def warm_up_inference_pool() -> None:
+    """
+    Start every inference worker so model loading and warm-up happen before traffic
+    Raises if the model can't be loaded, so the API doesn't start without a usable model.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        pids = await asyncio.gather(
+            *(
+                loop.run_in_executor(batcher.executor, ping_inference_worker)
+                for _ in range(inference_workers)
+            )
+        )
+    except Exception as e:
+        logger.error(f"Inference worker warm-up failed: {e}")
+        raise
+    logger.info(f"Inference workers ready: {sorted(set(pids))}")
+
+
+async def ping_inference_pool() -> None:
+    """Ping one inference worker, raising if it has no model or doesn't answer in time"""
+    await asyncio.wait_for(
+        asyncio.get_running_loop().run_in_executor(batcher.executor, ping_inference_worker),
+        timeout=health_check_timeout,
+    )
+
+
+async def inference_pool_ready() -> bool:
+    """
+    Check that an inference worker answers with a loaded model
+    A broken pool (e.g. a worker died) is replaced and pinged again, so the service recovers
+    without waiting for an analysis request to fail.
+    """
+    executor = batcher.executor
+    try:
+        try:
+            await ping_inference_pool()
+        except BrokenExecutor:
+            if not batcher.reset_executor(executor):
+                raise
+            await ping_inference_pool()
+    except Exception as e:
+        logger.warning(f"Inference worker health check failed: {e!r}")
+        return False
+    return True
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop background services with the app"""
+    await warm_up_inference_pool()
+    await batcher.start()
+    yield
+    await batcher.stop()
+    batcher.executor.shutdown(cancel_futures=True)
+    await collector.aclose()
+    if redis_client is not None:
+        await redis_client.aclose()
+
+
+async def get_cached_report(key: str) -> Optional[Dict[str, Any]]:
+    """Return a cached report, or None on a miss or when Redis is unavailable"""
+    if redis_client is None:
+        return None
+
+    try:
+        cached = await redis_client.get(key)
+    except Exception as e:
+        cache_stats["errors"] += 1
+        logger.warning(f"Redis cache read failed: {e}")
+        return None
+
+    if cached is None:
+        cache_stats["misses"] += 1
+        return None
+
+    cache_stats["hits"] += 1
+    return orjson.loads(cached)
+
+
+async def set_cached_report(key: str, report: Dict[str, Any]) -> None:
+    """Store a report in the cache with the configured TTL"""
+    if redis_client is None:
+        return
+
+    try:
+        await redis_client.set(
+            key, orjson.dumps(report, option=orjson.OPT_SERIALIZE_NUMPY), ex=analysis_cache_ttl
+        )
+    except Exception as e:
+        cache_stats["errors"] += 1
+        logger.warning(f"Redis cache write failed: {e}")
+
+
 # Initialize FastAPI app
 app = FastAPI(
-    title="StockSentinel API", description="Financial News Sentiment Analysis API", version="0.1.0"
+    title="StockSentinel API",
+    description="Financial News Sentiment Analysis API",
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware
@@ -29,31 +175,42 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize components (singleton pattern)
-collector = NewsCollector()
-analyzer = SentimentAnalyzer()
-scorer = StockScorer()
-
 
 # Pydantic models
 class AnalysisRequest(BaseModel):
     """Request model for sentiment analysis"""
 
+    model_config = ConfigDict(extra="ignore")
+
     ticker: str = Field(..., description="Stock ticker symbol (e.g., AAPL)")
     days: int = Field(7, ge=1, le=30, description="Number of days to look back")
     max_articles: int = Field(50, ge=1, le=100, description="Maximum number of articles")
 
 
+class ArticleOut(BaseModel):
+    """Summary of a top article in a sentiment report"""
+
+    model_config = ConfigDict(extra="ignore")
+
+    title: str = ""
+    sentiment_score: float = 0.0
+    sentiment_label: str = "neutral"
+    url: str = ""
+    published_at: str = ""
+
+
 class SentimentResponse(BaseModel):
     """Response model for sentiment analysis"""
 
+    model_config = ConfigDict(extra="ignore")
+
     ticker: str
     analysis_date: str
     stock_info: Dict[str, Any]
     sentiment_analysis: Dict[str, Any]
     scoring: Dict[str, Any]
     article_count: int
-    top_articles: List[Dict[str, Any]]
+    top_articles: List[ArticleOut]
 
 
 # Routes
@@ -65,6 +222,9 @@ async def root():
         "version": "0.1.0",
         "endpoints": {
             "analyze": "/api/analyze/{ticker}",
+            "analyze_stream": "/api/analyze/{ticker}/stream",
+            "analyze_job": "POST /api/analyze/{ticker}",
+            "analyze_status": "/api/analyze/status/{job_id}",
             "info": "/api/stock-info/{ticker}",
             "health": "/health",
         },
@@ -73,12 +233,37 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
-    return {
-        "status": "healthy",
+    """Health check endpoint (503 when no inference worker has a usable model)"""
+    analyzer_ok = await inference_pool_ready()
+    health = {
+        "status": "healthy" if analyzer_ok else "degraded",
         "timestamp": datetime.now().isoformat(),
-        "components": {"news_collector": "ok", "sentiment_analyzer": "ok", "stock_scorer": "ok"},
+        "components": {
+            "news_collector": "ok",
+            "sentiment_analyzer": "ok" if analyzer_ok else "unavailable",
+            "stock_scorer": "ok",
+        },
+        "cache": {"enabled": redis_client is not None, **cache_stats},
     }
+    return ORJSONResponse(health, status_code=200 if analyzer_ok else 503)
+
+
+async def ensure_valid_ticker(ticker: str) -> None:
+    """Raise a 400 error for invalid tickers (network-bound, run off the event loop)"""
+    if not await asyncio.get_running_loop().run_in_executor(None, validate_ticker, ticker):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid ticker symbol: {ticker}. Please provide a valid stock ticker.",
+        )
+
+
+async def build_report(ticker: str, analyzed_articles: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate sentiment, score the stock and build the report"""
+    aggregated = SentimentAnalyzer.get_aggregated_sentiment(analyzed_articles)
+    scoring = scorer.calculate_score(aggregated, analyzed_articles)
+    return await asyncio.get_running_loop().run_in_executor(
+        None, scorer.generate_report, ticker, aggregated, analyzed_articles, scoring
+    )
 
 
 @app.get("/api/analyze/{ticker}", response_model=SentimentResponse)
@@ -95,32 +280,36 @@ async def analyze_ticker(
     - **max_articles**: Maximum number of articles to analyze (1-100)
     """
     ticker = format_ticker(ticker)
+
+    cache_key = f"analysis:{ticker}:{days}:{max_articles}"
+    cached = await get_cached_report(cache_key)
+    if cached is not None:
+        logger.info(f"Cache hit for {cache_key}")
+        return cached
+
     logger.info(f"Analyzing {ticker} with FinBERT, days={days}")
 
     # Validate ticker
-    if not validate_ticker(ticker):
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid ticker symbol: {ticker}. Please provide a valid stock ticker.",
-        )
+    await ensure_valid_ticker(ticker)
 
     try:
         # Step 1: Collect news
-        articles = collector.collect_all(ticker, days=days, max_articles=max_articles)
+        articles = await collector.collect_all_async(ticker, days=days, max_articles=max_articles)
 
         if not articles:
             raise HTTPException(
                 status_code=404, detail=f"No news articles found for ticker {ticker}"
             )
 
-        # Step 2: Analyze sentiment with FinBERT
-        analyzed_articles = analyzer.analyze_articles(articles)
+        # Step 2: Analyze sentiment with FinBERT, batched with concurrent requests
+        analyzed_articles = list(
+            await asyncio.gather(*(batcher.analyze_article_async(a) for a in articles))
+        )
 
         # Step 3: Calculate scores
-        aggregated = analyzer.get_aggregated_sentiment(analyzed_articles)
-        scoring = scorer.calculate_score(aggregated, analyzed_articles)
-        report = scorer.generate_report(ticker, aggregated, analyzed_articles, scoring)
+        report = await build_report(ticker, analyzed_articles)
 
+        await set_cached_report(cache_key, report)
         return report
 
     except HTTPException:
@@ -130,6 +319,137 @@ async def analyze_ticker(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/analyze/{ticker}/stream")
+async def analyze_ticker_stream(
+    ticker: str,
+    days: int = Query(7, ge=1, le=30, description="Days to look back"),
+    max_articles: int = Query(50, ge=1, le=100, description="Max articles"),
+):
+    """
+    Analyze a ticker and stream progress as newline-delimited JSON
+
+    Emits one JSON object per line:
+    - `{"type": "collected", "n": ...}` once news collection finishes
+    - `{"type": "sentiment", "done": ..., "total": ..., "article": {...}}` per analyzed article
+    - `{"type": "report", "report": {...}}` with the same report as `/api/analyze/{ticker}`
+    - `{"type": "error", "detail": ...}` if the analysis fails after streaming started
+    """
+    ticker = format_ticker(ticker)
+    await ensure_valid_ticker(ticker)
+
+    cache_key = f"analysis:{ticker}:{days}:{max_articles}"
+
+    def event(payload: Dict[str, Any]) -> bytes:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n"
+
+    async def event_gen() -> AsyncIterator[bytes]:
+        cached = await get_cached_report(cache_key)
+        if cached is not None:
+            yield event({"type": "report", "report": cached})
+            return
+
+        tasks: List[asyncio.Future] = []
+        try:
+            articles = await collector.collect_all_async(
+                ticker, days=days, max_articles=max_articles
+            )
+            yield event({"type": "collected", "n": len(articles)})
+
+            if not articles:
+                yield event(
+                    {"type": "error", "detail": f"No news articles found for ticker {ticker}"}
+                )
+                return
+
+            tasks = [asyncio.ensure_future(batcher.analyze_article_async(a)) for a in articles]
+            for done, next_task in enumerate(asyncio.as_completed(tasks), 1):
+                analyzed = await next_task
+                yield event(
+                    {
+                        "type": "sentiment",
+                        "done": done,
+                        "total": len(tasks),
+                        "article": {
+                            "title": analyzed.get("title", ""),
+                            "sentiment_score": analyzed["sentiment"]["score"],
+                            "sentiment_label": analyzed["sentiment_label"],
+                        },
+                    }
+                )
+
+            report = await build_report(ticker, [task.result() for task in tasks])
+            await set_cached_report(cache_key, report)
+            yield event({"type": "report", "report": report})
+
+        except Exception as e:
+            logger.error(f"Error streaming analysis for {ticker}: {e}", exc_info=True)
+            yield event({"type": "error", "detail": str(e)})
+        finally:
+            # A client that disconnects mid-stream leaves its articles queued; drop them so
+            # they don't take batcher capacity from live requests
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(event_gen(), media_type="application/x-ndjson")
+
+
+def require_task_queue() -> None:
+    """Raise a 503 error when Celery is not installed"""
+    if analyze_task is None:
+        raise HTTPException(status_code=503, detail="Background analysis is not available")
+
+
+@app.post("/api/analyze/{ticker}", status_code=202)
+async def submit_analysis(
+    ticker: str,
+    days: int = Query(7, ge=1, le=30, description="Days to look back"),
+    max_articles: int = Query(50, ge=1, le=100, description="Max articles"),
+):
+    """
+    Queue an analysis on a Celery worker and return its job id
+
+    Poll `/api/analyze/status/{job_id}` for the result.
+    """
+    require_task_queue()
+    ticker = format_ticker(ticker)
+    await ensure_valid_ticker(ticker)
+
+    try:
+        task = await asyncio.get_running_loop().run_in_executor(
+            None, lambda: analyze_task.delay(ticker, days, max_articles)
+        )
+    except Exception as e:
+        logger.error(f"Error queueing analysis for {ticker}: {e}")
+        raise HTTPException(status_code=503, detail="Task queue is unavailable")
+
+    return {"job_id": task.id, "status_url": f"/api/analyze/status/{task.id}"}
+
+
+@app.get("/api/analyze/status/{job_id}")
+async def get_analysis_status(job_id: str):
+    """
+    Get the state of a queued analysis, with the report once it has finished
+
+    - **job_id**: Id returned by `POST /api/analyze/{ticker}`
+    """
+    require_task_queue()
+
+    def fetch_status() -> Dict[str, Any]:
+        result = celery_app.AsyncResult(job_id)
+        status = {"job_id": job_id, "state": result.state}
+        if result.successful():
+            status["report"] = result.result
+        elif result.failed():
+            status["error"] = str(result.result)
+        return status
+
+    try:
+        return await asyncio.get_running_loop().run_in_executor(None, fetch_status)
+    except Exception as e:
+        logger.error(f"Error fetching status for job {job_id}: {e}")
+        raise HTTPException(status_code=503, detail="Task queue is unavailable")
+
+
 @app.get("/api/stock-info/{ticker}")
 async def get_stock_info(ticker: str):
     """
@@ -140,7 +460,7 @@ async def get_stock_info(ticker: str):
     ticker = format_ticker(ticker)
 
     try:
-        info = scorer.get_stock_info(ticker)
+        info = await asyncio.get_running_loop().run_in_executor(None, scorer.get_stock_info, ticker)
         return info
     except Exception as e:
         logger.error(f"Error fetching stock info for {ticker}: {e}")
@@ -2,8 +2,11 @@ import streamlit as st
 import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
+import numpy as np
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from streamlit_autorefresh import st_autorefresh
 
 # Add src to path
 sys.path.append(str(Path(__file__).parent.parent))
@@ -13,6 +16,9 @@ from src.sentiment_analyzer import SentimentAnalyzer
 from src.stock_scorer import StockScorer
 from src.utils import ensure_directories, format_ticker, validate_ticker
 
+# Histograms above this many points are drawn from a random sample
+MAX_HISTOGRAM_POINTS = 1000
+
 # Page config
 st.set_page_config(
     page_title="StockSentinel", page_icon="📈", layout="wide", initial_sidebar_state="expanded"
@@ -41,8 +47,61 @@ st.markdown(
 # Initialize session state
 if "analysis_results" not in st.session_state:
     st.session_state.analysis_results = None
+    st.session_state.analyzed_articles = []
+
+if "analysis_job" not in st.session_state:
+    st.session_state.analysis_job = None
+
+
+@st.cache_resource
+def get_collector():
+    """Create the news collector once per server process"""
+    return NewsCollector()
+
+
+@st.cache_resource
+def get_analyzer():
+    """Load FinBERT once per server process instead of on every rerun"""
+    return SentimentAnalyzer()
+
+
+@st.cache_resource
+def get_scorer():
+    """Create the stock scorer once per server process"""
+    return StockScorer()
+
+
+@st.cache_resource
+def get_executor():
+    """Shared worker threads that run analyses in the background"""
+    return ThreadPoolExecutor(max_workers=2)
 
 
+@st.cache_data(ttl="15m", max_entries=128, show_spinner=False)
+def run_analysis(ticker, days, max_articles):
+    """
+    Run the full collect -> analyze -> score pipeline, cached per (ticker, days, max_articles)
+    Returns:
+        Tuple of (report, analyzed articles), or (None, []) if no news was found
+    """
+    collector = get_collector()
+    analyzer = get_analyzer()
+    scorer = get_scorer()
+
+    articles = collector.collect_all(ticker, days=days, max_articles=max_articles)
+    if not articles:
+        return None, []
+
+    analyzed_articles = analyzer.analyze_articles(articles)
+
+    aggregated = analyzer.get_aggregated_sentiment(analyzed_articles)
+    scoring = scorer.calculate_score(aggregated, analyzed_articles)
+    report = scorer.generate_report(ticker, aggregated, analyzed_articles, scoring)
+
+    return report, analyzed_articles
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
 def create_sentiment_gauge(score, label):
     """Create a gauge chart for sentiment score"""
     fig = go.Figure(
@@ -77,9 +136,36 @@ def create_sentiment_gauge(score, label):
     return fig
 
 
-def create_sentiment_distribution(articles):
-    """Create distribution chart of sentiment scores"""
-    sentiments = [a["sentiment"]["score"] for a in articles if "sentiment" in a]
+@st.cache_data(max_entries=32)
+def get_articles_frame(report_id, _articles):
+    """
+    Normalize analyzed articles into one DataFrame shared by the charts
+    Cached per report id; the article list itself is not hashed.
+    Dates are parsed once here and the frame is sorted by date.
+    """
+    df = pd.json_normalize(_articles)
+    if df.empty or "sentiment.score" not in df:
+        return pd.DataFrame(columns=["published_at", "date", "title", "sentiment"])
+
+    df = df.rename(columns={"sentiment.score": "sentiment"})
+    df = df.dropna(subset=["sentiment"])
+
+    # The collector normalizes published_at to one UTC ISO format, so no format inference
+    df["date"] = pd.to_datetime(df["published_at"], utc=True, errors="coerce")
+    df = df.sort_values("date", kind="stable")
+    return df[["published_at", "date", "title", "sentiment"]].reset_index(drop=True)
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def create_sentiment_distribution(report_id, _articles_df):
+    """Create distribution chart of sentiment scores (cached per report id)"""
+    articles_df = _articles_df
+    sentiments = articles_df["sentiment"].to_numpy()
+
+    # Large article sets are downsampled; the histogram shape is preserved
+    if len(sentiments) > MAX_HISTOGRAM_POINTS:
+        rng = np.random.default_rng(0)
+        sentiments = rng.choice(sentiments, MAX_HISTOGRAM_POINTS, replace=False)
 
     fig = px.histogram(
         x=sentiments,
@@ -94,25 +180,17 @@ def create_sentiment_distribution(articles):
     return fig
 
 
-def create_timeline_chart(articles):
-    """Create timeline of articles with sentiment"""
-    data = []
-    for article in articles:
-        if "sentiment" in article:
-            data.append(
-                {
-                    "date": article.get("published_at", ""),
-                    "sentiment": article["sentiment"]["score"],
-                    "title": article.get("title", "")[:50] + "...",
-                }
-            )
-
-    df = pd.DataFrame(data)
-    if df.empty:
+@st.cache_data(max_entries=32, show_spinner=False)
+def create_timeline_chart(report_id, _articles_df):
+    """Create timeline of articles with sentiment (cached per report id)"""
+    articles_df = _articles_df
+    if articles_df.empty:
         return None
 
-    df["date"] = pd.to_datetime(df["date"], format="ISO8601", utc=True)
-    df = df.sort_values("date")
+    # Dates are already parsed and sorted in get_articles_frame
+    df = articles_df[["date", "sentiment"]].assign(
+        title=articles_df["title"].fillna("").str[:50] + "..."
+    )
 
     fig = px.scatter(
         df,
@@ -208,50 +286,54 @@ def main():
                 st.info("💡 Tip: Make sure the ticker is listed on a major stock exchange.")
                 return
 
-        with st.spinner(f"Analyzing {ticker_formatted}... This may take a moment."):
-            try:
-                # Initialize components
-                collector = NewsCollector()
-                analyzer = SentimentAnalyzer()
-                scorer = StockScorer()
-
-                # Collect news
-                st.info(f"📰 Collecting news for {ticker_formatted}...")
-                articles = collector.collect_all(
-                    ticker_formatted, days=days, max_articles=max_articles
-                )
-
-                if not articles:
-                    st.error(f"No news articles found for {ticker_formatted}")
-                    st.info("💡 Try:")
-                    st.markdown("- A different ticker symbol")
-                    st.markdown("- Increasing the number of days")
-                    st.markdown("- Checking if the company has recent news coverage")
-                    return
-
-                st.success(f"Collected {len(articles)} articles")
-
-                # Analyze sentiment
-                st.info("🧠 Analyzing sentiment with FinBERT...")
-                analyzed_articles = analyzer.analyze_articles(articles)
-
-                # Calculate scores
-                st.info("📊 Calculating scores...")
-                aggregated = analyzer.get_aggregated_sentiment(analyzed_articles)
-                scoring = scorer.calculate_score(aggregated, analyzed_articles)
-                report = scorer.generate_report(
-                    ticker_formatted, aggregated, analyzed_articles, scoring
-                )
-
-                st.session_state.analysis_results = report
+        # Run the analysis on a background thread so the script returns right away
+        st.session_state.analysis_job = {
+            "ticker": ticker_formatted,
+            "future": get_executor().submit(run_analysis, ticker_formatted, days, max_articles),
+        }
+
+    job = st.session_state.analysis_job
+    if job is not None:
+        future = job["future"]
+        ticker_formatted = job["ticker"]
+
+        if not future.done():
+            with st.status(f"Analyzing {ticker_formatted}...", expanded=True):
+                st.write(f"📰 Collecting news for {ticker_formatted}...")
+                st.write("🧠 Analyzing sentiment with FinBERT and calculating scores...")
+                if st.button("Cancel"):
+                    # A running analysis still finishes in the background; its result is dropped
+                    future.cancel()
+                    st.session_state.analysis_job = None
+                    st.rerun()
+
+            # Rerun every second until the analysis is done
+            st_autorefresh(interval=1000, key="analysis_poll")
+        else:
+            st.session_state.analysis_job = None
 
+            try:
+                report, analyzed_articles = future.result()
             except Exception as e:
                 st.error(f"Error during analysis: {str(e)}")
                 return
 
+            if report is None:
+                st.error(f"No news articles found for {ticker_formatted}")
+                st.info("💡 Try:")
+                st.markdown("- A different ticker symbol")
+                st.markdown("- Increasing the number of days")
+                st.markdown("- Checking if the company has recent news coverage")
+                return
+
+            st.session_state.analysis_results = report
+            st.session_state.analyzed_articles = analyzed_articles
+
     # Display results
     if st.session_state.analysis_results:
         report = st.session_state.analysis_results
+        report_id = f"{report['ticker']}:{report['analysis_date']}"
+        articles_df = get_articles_frame(report_id, st.session_state.analyzed_articles)
 
         # Stock info
         stock_info = report["stock_info"]
@@ -306,12 +388,12 @@ def main():
 
         with col2:
             st.markdown("### Sentiment Distribution")
-            dist_fig = create_sentiment_distribution(analyzed_articles)
+            dist_fig = create_sentiment_distribution(report_id, articles_df)
             st.plotly_chart(dist_fig, use_container_width=True)
 
         # Timeline
         st.markdown("### 📅 Sentiment Timeline")
-        timeline_fig = create_timeline_chart(analyzed_articles)
+        timeline_fig = create_timeline_chart(report_id, articles_df)
         if timeline_fig:
             st.plotly_chart(timeline_fig, use_container_width=True)
 
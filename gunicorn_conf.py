@@ -0,0 +1,20 @@
+"""Gunicorn settings for serving the FastAPI app with multiple Uvicorn worker processes"""
+
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+
+# WEB_CONCURRENCY overrides the worker count
+workers = int(os.getenv("WEB_CONCURRENCY", max(2, multiprocessing.cpu_count() // 2)))
+worker_class = "uvicorn_worker.UvicornWorker"
+
+# Workers don't heartbeat until the app's lifespan startup finishes, and on first boot that
+# includes the FinBERT download, the ONNX export (src/onnx_export.py) and the inference pool
+# warm-up. These aren't baked into the image because docker-compose mounts ./models over it,
+# so the timeout has to cover a cold start; GUNICORN_TIMEOUT overrides it
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "600"))
+graceful_timeout = timeout
+
+# Workers inherit this, so inference threads are split across them (see src/sentiment_analyzer.py)
+os.environ["WEB_CONCURRENCY"] = str(workers)
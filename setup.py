@@ -23,6 +23,7 @@ setup(
         "transformers>=4.30.0",
         "torch>=2.0.0",
         "fastapi>=0.100.0",
+        "pydantic>=2.5",
         "uvicorn>=0.23.0",
         "streamlit>=1.25.0",
         "plotly>=5.15.0",
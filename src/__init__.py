@@ -1,8 +1,20 @@
 __version__ = "0.1.0"
 __author__ = "Tom Schillerwein"
 
-from .data_collector import NewsCollector
-from .sentiment_analyzer import SentimentAnalyzer
-from .stock_scorer import StockScorer
+from importlib import import_module
+
+# Classes are imported on first access, so "import src.utils" doesn't load torch and yfinance
+_EXPORTS = {
+    "NewsCollector": ".data_collector",
+    "SentimentAnalyzer": ".sentiment_analyzer",
+    "StockScorer": ".stock_scorer",
+}
 
 __all__ = ["NewsCollector", "SentimentAnalyzer", "StockScorer"]
+
+
+def __getattr__(name: str):
+    """Import exported classes lazily"""
+    if name in _EXPORTS:
+        return getattr(import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,41 @@
+# Snapshot of S&P 500 constituents with plain 1-5 letter symbols (class shares such as BRK.B
+# fail the format check anyway). Used only to skip the yfinance lookup for well-known symbols;
+# anything missing here is still validated online, so an outdated snapshot costs one request.
+KNOWN_TICKERS: frozenset = frozenset("""
+    A AAPL ABBV ABNB ABT ACGL ACN ADBE ADI ADM ADP ADSK AEE AEP AES AFL AIG AIZ AJG AKAM ALB
+    ALGN ALL ALLE AMAT AMCR AMD AME AMGN AMP AMT AMZN ANET AON AOS APA APD APH APO APP APTV ARE
+    ATO AVB AVGO AVY AWK AXON AXP AZO
+    BA BAC BALL BAX BBY BDX BEN BG BIIB BK BKNG BKR BLDR BLK BMY BR BRO BSX BX BXP
+    C CAG CAH CARR CAT CB CBOE CBRE CCI CCL CDNS CDW CEG CF CFG CHD CHRW CHTR CI CINF CL CLX
+    CMCSA CME CMG CMI CMS CNC CNP COF COIN COO COP COR COST CPAY CPB CPRT CPT CRL CRM CRWD CSCO
+    CSGP CSX CTAS CTRA CTSH CTVA CVS CVX CZR
+    D DAL DASH DD DDOG DE DECK DELL DG DGX DHI DHR DIS DLR DLTR DOC DOV DOW DPZ DRI DTE DUK DVA
+    DVN DXCM
+    EBAY ECL ED EFX EG EIX EL ELV EMN EMR ENPH EOG EPAM EQIX EQR EQT ERIE ES ESS ETN ETR EVRG
+    EW EXC EXE EXPD EXPE EXR
+    F FANG FAST FCX FDS FDX FE FFIV FICO FIS FITB FOX FOXA FRT FSLR FTNT FTV
+    GD GDDY GE GEHC GEN GEV GILD GIS GL GLW GM GNRC GOOG GOOGL GPC GPN GRMN GS GWW
+    HAL HAS HBAN HCA HD HIG HII HLT HON HOOD HPE HPQ HRL HSIC HST HSY HUBB HUM HWM
+    IBKR IBM ICE IDXX IEX IFF INCY INTC INTU INVH IP IQV IR IRM ISRG IT ITW IVZ
+    J JBHT JBL JCI JKHY JNJ JPM
+    KDP KEY KEYS KHC KIM KKR KLAC KMB KMI KMX KO KR
+    L LDOS LEN LH LHX LII LIN LKQ LLY LMT LNT LOW LRCX LULU LUV LVS LW LYB LYV
+    MA MAA MAR MAS MCD MCHP MCK MCO MDLZ MDT MET META MGM MHK MKC MKTX MLM MMM MNST MO MOH MOS
+    MPC MPWR MRK MRNA MS MSCI MSFT MSI MTB MTCH MTD MU
+    NCLH NDAQ NDSN NEE NEM NFLX NI NKE NOC NOW NRG NSC NTAP NTRS NUE NVDA NVR NWS NWSA NXPI
+    O ODFL OKE OMC ON ORCL ORLY OTIS OXY
+    PANW PAYC PAYX PCAR PCG PEG PEP PFE PFG PG PGR PH PHM PKG PLD PLTR PM PNC PNR PNW PODD POOL
+    PPG PPL PRU PSA PSX PTC PWR PYPL
+    QCOM
+    RCL REG REGN RF RJF RL RMD ROK ROL ROP ROST RSG RTX RVTY
+    SBAC SBUX SCHW SHW SJM SLB SMCI SNA SNPS SO SOLV SPG SPGI SRE STE STLD STT STX STZ SW SWK
+    SWKS SYF SYK SYY
+    T TAP TDG TDY TECH TEL TER TFC TGT TJX TKO TMO TMUS TPL TPR TRGP TRMB TROW TRV TSCO TSLA
+    TSN TT TTD TTWO TXN TXT TYL
+    UAL UBER UDR UHS ULTA UNH UNP UPS URI USB
+    V VICI VLO VLTO VMC VRSK VRSN VRTX VST VTR VTRS VZ
+    WAB WAT WDAY WDC WEC WELL WFC WM WMB WMT WRB WSM WST WTW WY WYNN
+    XEL XOM XYL XYZ
+    YUM
+    ZBH ZBRA ZTS
+    """.split())
@@ -0,0 +1,213 @@
+import asyncio
+import logging
+import os
+from concurrent.futures import BrokenExecutor, Executor
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .sentiment_analyzer import SentimentAnalyzer
+
+logger = logging.getLogger(__name__)
+
+# Analyzer owned by an inference worker process (see init_inference_worker)
+_worker_analyzer: Optional[SentimentAnalyzer] = None
+
+
+def init_inference_worker(model_name: str = "ProsusAI/finbert") -> None:
+    """
+    Load and warm up FinBERT once in an inference worker process
+    Args:
+        model_name: Hugging Face model name
+    """
+    global _worker_analyzer
+    _worker_analyzer = SentimentAnalyzer(model_name)
+    _worker_analyzer.warmup()
+
+
+def ping_inference_worker() -> int:
+    """Return the worker's pid once its analyzer is loaded (used to start workers eagerly)"""
+    if _worker_analyzer is None:
+        raise RuntimeError("Inference worker is not initialized")
+    return os.getpid()
+
+
+def analyze_texts_in_worker(texts: List[str]) -> List[Dict[str, float]]:
+    """Run a batch through the worker's analyzer (executed inside the worker process)"""
+    if _worker_analyzer is None:
+        raise RuntimeError("Inference worker is not initialized")
+    return _worker_analyzer.analyze_texts(texts)
+
+
+class DynamicBatcher:
+    """Coalesce sentiment requests from concurrent callers into shared FinBERT forward passes"""
+
+    def __init__(
+        self,
+        analyze_fn: Callable[[List[str]], List[Dict[str, float]]],
+        executor: Optional[Executor] = None,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: float = 10.0,
+        executor_factory: Optional[Callable[[], Executor]] = None,
+        max_concurrent_batches: Optional[int] = None,
+    ):
+        """
+        Initialize the batcher
+        Args:
+            analyze_fn: Batched sentiment function, e.g. SentimentAnalyzer.analyze_texts
+            executor: Executor running analyze_fn (default: the event loop's thread pool)
+            max_batch_size: Maximum texts per forward pass (default: INFERENCE_MAX_BATCH_SIZE or 32)
+            max_wait_ms: Maximum time to wait for more texts before running a batch
+            executor_factory: Creates the executor, and replaces it if it breaks (e.g. a worker
+                process died); takes precedence over executor
+            max_concurrent_batches: Batches run at the same time, one per inference worker
+                (default: INFERENCE_WORKERS or 1)
+        """
+        self.analyze_fn = analyze_fn
+        self.executor_factory = executor_factory
+        self.executor = executor_factory() if executor_factory is not None else executor
+        self.max_batch_size = max_batch_size or int(os.getenv("INFERENCE_MAX_BATCH_SIZE", "32"))
+        self.max_wait = max_wait_ms / 1000
+        self.max_concurrent_batches = max_concurrent_batches or int(
+            os.getenv("INFERENCE_WORKERS", "1")
+        )
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._batch_tasks: Set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        """Start the background batching task"""
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"Dynamic batcher started (max_batch_size={self.max_batch_size}, "
+            f"max_concurrent_batches={self.max_concurrent_batches})"
+        )
+
+    async def stop(self) -> None:
+        """Stop the background task and fail any pending requests"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        for task in list(self._batch_tasks):
+            task.cancel()
+        await asyncio.gather(*self._batch_tasks, return_exceptions=True)
+
+        while self._queue is not None and not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Batcher stopped"))
+
+    async def analyze_text_async(self, text: str) -> Dict[str, float]:
+        """
+        Queue a text for analysis and wait for its batch to finish
+        Args:
+            text: Input text
+        Returns:
+            Dictionary with sentiment scores
+        """
+        if self._task is None:
+            raise RuntimeError("Batcher is not running")
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def analyze_article_async(self, article: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Analyze sentiment of a single article through the shared batch
+        Args:
+            article: Article dictionary with 'title', 'description', 'content'
+        Returns:
+            Article with added sentiment analysis
+        """
+        sentiment = await self.analyze_text_async(SentimentAnalyzer.get_article_text(article))
+        return SentimentAnalyzer.attach_sentiment(article, sentiment)
+
+    async def _collect_batch(self) -> List[Tuple[str, asyncio.Future]]:
+        """Wait for the first item, then gather more until the batch is full or time is up"""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self) -> None:
+        """Background loop starting a forward pass per batch, up to the concurrency limit"""
+        slots = asyncio.Semaphore(self.max_concurrent_batches)
+
+        while True:
+            # Wait for a free worker first, so texts keep queueing into the next batch meanwhile
+            await slots.acquire()
+            try:
+                batch = await self._collect_batch()
+            except BaseException:
+                slots.release()
+                raise
+
+            # Skip requests whose callers have gone away
+            batch = [(text, future) for text, future in batch if not future.done()]
+            if not batch:
+                slots.release()
+                continue
+
+            task = asyncio.create_task(self._run_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+            task.add_done_callback(lambda _: slots.release())
+
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        """Run one forward pass in the executor and resolve the callers' futures"""
+        texts = [text for text, _ in batch]
+        executor = self.executor
+        try:
+            # Run the forward pass off the event loop
+            results = await asyncio.get_running_loop().run_in_executor(
+                executor, self.analyze_fn, texts
+            )
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            logger.error(f"Error in batched analysis: {e}")
+            if isinstance(e, BrokenExecutor):
+                self.reset_executor(executor)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def reset_executor(self, broken: Executor) -> bool:
+        """
+        Swap a broken executor for a new one, so later batches don't all fail
+        Args:
+            broken: The executor that raised BrokenExecutor
+        Returns:
+            True if the batcher now uses a different executor
+        """
+        if self.executor_factory is None:
+            return False
+        if self.executor is not broken:
+            # Already replaced by a concurrent failure
+            return True
+        logger.warning("Inference executor is broken; starting a new one")
+        broken.shutdown(wait=False, cancel_futures=True)
+        self.executor = self.executor_factory()
+        return True
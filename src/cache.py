@@ -0,0 +1,76 @@
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = ".cache"
+
+
+class FileCache:
+    """Persistent JSON cache on disk with a TTL per entry"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        """
+        Initialize the cache
+        Args:
+            cache_dir: Root directory; each namespace gets a subdirectory
+        """
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, namespace: str, key: str) -> Path:
+        """Build the file path for a cache entry"""
+        digest = hashlib.md5(key.encode("utf-8")).hexdigest()
+        return self.cache_dir / namespace / f"{digest}.json"
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """
+        Read a cache entry
+        Args:
+            namespace: Cache namespace, e.g. the data source
+            key: Entry key
+        Returns:
+            Cached data, or None if the entry is missing, expired or unreadable
+        """
+        path = self._path(namespace, key)
+        try:
+            entry = orjson.loads(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache entry {path}: {e}")
+            return None
+
+        if time.time() - entry.get("ts", 0) > entry.get("ttl", 0):
+            return None
+        return entry.get("data")
+
+    def set(self, namespace: str, key: str, data: Any, ttl: float) -> None:
+        """
+        Write a cache entry atomically
+        Args:
+            namespace: Cache namespace, e.g. the data source
+            key: Entry key
+            data: JSON-serializable data
+            ttl: Time to live in seconds
+        """
+        path = self._path(namespace, key)
+        entry = {"ts": time.time(), "ttl": ttl, "data": data}
+
+        tmp_path = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(orjson.dumps(entry, option=orjson.OPT_SERIALIZE_NUMPY))
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Failed to write cache entry {path}: {e}")
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -1,29 +1,80 @@
+import heapq
 import os
+import re
+import asyncio
+import aiohttp
+import orjson
 import requests
 import logging
-from typing import List, Dict, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
-import yfinance as yf
 
-from .utils import get_date_range, format_ticker, save_json
+from .cache import DEFAULT_CACHE_DIR, FileCache
+from .utils import get_date_range, format_ticker, save_json, to_utc_isoformat
+from .yf_pool import get_ticker
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+NEWS_API_URL = "https://newsapi.org/v2/everything"
+FINNHUB_URL = "https://finnhub.io/api/v1/company-news"
+MAX_CONCURRENT_REQUESTS = 10
+
+# Retry policy shared by the sync and async HTTP clients
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.3
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Results for ranges ending today can still change; past ranges are immutable
+NEWS_CACHE_TTL = int(os.getenv("NEWS_CACHE_TTL", "3600"))
+PAST_NEWS_CACHE_TTL = 7 * 86400
+
+# Titles are compared on this many casefolded letters and digits (any script)
+TITLE_KEY_LENGTH = 80
+_NON_WORD = re.compile(r"[\W_]+")
+
 
 class NewsCollector:
     """Collect financial news from multiple sources"""
 
-    def __init__(self):
-        """Initialize NewsCollector with API keys from environment"""
+    def __init__(self, cache_dir: Optional[str] = DEFAULT_CACHE_DIR):
+        """
+        Initialize NewsCollector with API keys from environment
+        Args:
+            cache_dir: Directory for the on-disk response cache (None disables caching)
+        """
         self.news_api_key = os.getenv("NEWS_API_KEY")
         self.finnhub_key = os.getenv("FINNHUB_API_KEY")
+        self.cache = FileCache(cache_dir) if cache_dir else None
+        self.session = self._create_session()
+        # aiohttp session for collect_all_async, created on first use inside the event loop
+        self._async_session: Optional[aiohttp.ClientSession] = None
+        self._async_session_loop: Optional[asyncio.AbstractEventLoop] = None
 
         if not any([self.news_api_key, self.finnhub_key]):
             logger.warning("No API keys found. Please set up .env file.")
 
+    @staticmethod
+    def _create_session() -> requests.Session:
+        """Create an HTTP session with pooled keep-alive connections and retries"""
+        retry = Retry(
+            total=MAX_RETRIES,
+            backoff_factor=RETRY_BACKOFF,
+            status_forcelist=list(RETRY_STATUSES),
+            allowed_methods=["GET"],
+        )
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
     def collect_news_api(self, ticker: str, days: int = 7) -> List[Dict[str, Any]]:
         """
         Collect news from NewsAPI
@@ -38,10 +89,29 @@ class NewsCollector:
             return []
 
         ticker = format_ticker(ticker)
-        start_date, end_date = get_date_range(days)
+        params = self._news_api_params(ticker, days)
+        cache_key = f"{ticker}:{params['from']}:{params['to']}"
+        cached = self._get_cached_articles("newsapi", cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            response = self.session.get(NEWS_API_URL, params=params, timeout=10)
+            response.raise_for_status()
+            articles = self._parse_news_api(orjson.loads(response.content))
 
-        url = "https://newsapi.org/v2/everything"
-        params = {
+            logger.info(f"Collected {len(articles)} articles from NewsAPI for {ticker}")
+            self._cache_articles("newsapi", cache_key, articles, params["to"])
+            return articles
+
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+            logger.error(f"Error fetching from NewsAPI: {e}")
+            return []
+
+    def _news_api_params(self, ticker: str, days: int) -> Dict[str, Any]:
+        """Build NewsAPI query parameters"""
+        start_date, end_date = get_date_range(days)
+        return {
             "q": f"{ticker} stock OR {ticker} shares",
             "from": start_date,
             "to": end_date,
@@ -51,31 +121,22 @@ class NewsCollector:
             "pageSize": 100,
         }
 
-        try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-
-            articles = []
-            for article in data.get("articles", []):
-                articles.append(
-                    {
-                        "source": "newsapi",
-                        "title": article.get("title", ""),
-                        "description": article.get("description", ""),
-                        "content": article.get("content", ""),
-                        "url": article.get("url", ""),
-                        "published_at": article.get("publishedAt", ""),
-                        "source_name": article.get("source", {}).get("name", "Unknown"),
-                    }
-                )
-
-            logger.info(f"Collected {len(articles)} articles from NewsAPI for {ticker}")
-            return articles
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error fetching from NewsAPI: {e}")
-            return []
+    def _parse_news_api(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Convert a NewsAPI response into article dictionaries"""
+        articles = []
+        for article in data.get("articles", []):
+            articles.append(
+                {
+                    "source": "newsapi",
+                    "title": article.get("title", ""),
+                    "description": article.get("description", ""),
+                    "content": article.get("content", ""),
+                    "url": article.get("url", ""),
+                    "published_at": to_utc_isoformat(article.get("publishedAt", "")),
+                    "source_name": article.get("source", {}).get("name", "Unknown"),
+                }
+            )
+        return articles
 
     def collect_finnhub(self, ticker: str, days: int = 7) -> List[Dict[str, Any]]:
         """
@@ -91,38 +152,48 @@ class NewsCollector:
             return []
 
         ticker = format_ticker(ticker)
-        start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
-        end_date = datetime.now().strftime("%Y-%m-%d")
-
-        url = "https://finnhub.io/api/v1/company-news"
-        params = {"symbol": ticker, "from": start_date, "to": end_date, "token": self.finnhub_key}
+        params = self._finnhub_params(ticker, days)
+        cache_key = f"{ticker}:{params['from']}:{params['to']}"
+        cached = self._get_cached_articles("finnhub", cache_key)
+        if cached is not None:
+            return cached
 
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(FINNHUB_URL, params=params, timeout=10)
             response.raise_for_status()
-            data = response.json()
-
-            articles = []
-            for item in data:
-                articles.append(
-                    {
-                        "source": "finnhub",
-                        "title": item.get("headline", ""),
-                        "description": item.get("summary", ""),
-                        "content": item.get("summary", ""),
-                        "url": item.get("url", ""),
-                        "published_at": datetime.fromtimestamp(item.get("datetime", 0)).isoformat(),
-                        "source_name": item.get("source", "Finnhub"),
-                    }
-                )
+            articles = self._parse_finnhub(orjson.loads(response.content))
 
             logger.info(f"Collected {len(articles)} articles from Finnhub for {ticker}")
+            self._cache_articles("finnhub", cache_key, articles, params["to"])
             return articles
 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             logger.error(f"Error fetching from Finnhub: {e}")
             return []
 
+    def _finnhub_params(self, ticker: str, days: int) -> Dict[str, Any]:
+        """Build Finnhub query parameters"""
+        start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+        end_date = datetime.now().strftime("%Y-%m-%d")
+        return {"symbol": ticker, "from": start_date, "to": end_date, "token": self.finnhub_key}
+
+    def _parse_finnhub(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Convert a Finnhub response into article dictionaries"""
+        articles = []
+        for item in data:
+            articles.append(
+                {
+                    "source": "finnhub",
+                    "title": item.get("headline", ""),
+                    "description": item.get("summary", ""),
+                    "content": item.get("summary", ""),
+                    "url": item.get("url", ""),
+                    "published_at": to_utc_isoformat(item.get("datetime", 0)),
+                    "source_name": item.get("source", "Finnhub"),
+                }
+            )
+        return articles
+
     def collect_yfinance_news(self, ticker: str) -> List[Dict[str, Any]]:
         """
         Collect news from Yahoo Finance via yfinance
@@ -132,9 +203,12 @@ class NewsCollector:
             List of news articles
         """
         ticker = format_ticker(ticker)
+        cached = self._get_cached_articles("yahoo_finance", ticker)
+        if cached is not None:
+            return cached
 
         try:
-            stock = yf.Ticker(ticker)
+            stock = get_ticker(ticker)
             news = stock.news
 
             articles = []
@@ -146,14 +220,13 @@ class NewsCollector:
                         "description": item.get("summary", ""),
                         "content": item.get("summary", ""),
                         "url": item.get("link", ""),
-                        "published_at": datetime.fromtimestamp(
-                            item.get("providerPublishTime", 0)
-                        ).isoformat(),
+                        "published_at": to_utc_isoformat(item.get("providerPublishTime", 0)),
                         "source_name": item.get("publisher", "Yahoo Finance"),
                     }
                 )
 
             logger.info(f"Collected {len(articles)} articles from Yahoo Finance for {ticker}")
+            self._cache_articles("yahoo_finance", ticker, articles)
             return articles
 
         except Exception as e:
@@ -175,27 +248,213 @@ class NewsCollector:
         ticker = format_ticker(ticker)
         logger.info(f"Collecting news for {ticker} from all sources...")
 
-        all_articles = []
+        # Query all sources in parallel threads; results keep source order for deduplication
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [
+                executor.submit(self.collect_news_api, ticker, days),
+                executor.submit(self.collect_finnhub, ticker, days),
+                executor.submit(self.collect_yfinance_news, ticker),
+            ]
+            all_articles = [article for future in futures for article in future.result()]
 
-        # Collect from all sources
-        all_articles.extend(self.collect_news_api(ticker, days))
-        all_articles.extend(self.collect_finnhub(ticker, days))
-        all_articles.extend(self.collect_yfinance_news(ticker))
+        return self._merge_articles(all_articles, max_articles)
 
-        # Remove duplicates based on title
-        seen_titles = set()
+    async def collect_all_async(
+        self, ticker: str, days: int = 7, max_articles: int = 50
+    ) -> List[Dict[str, Any]]:
+        """
+        Collect news from all available sources concurrently
+        Args:
+            ticker: Stock ticker symbol
+            days: Number of days to look back
+            max_articles: Maximum number of articles to return
+        Returns:
+            Combined list of news articles
+        """
+        ticker = format_ticker(ticker)
+        logger.info(f"Collecting news for {ticker} from all sources concurrently...")
+
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        session = self._get_async_session()
+
+        results = await asyncio.gather(
+            self._fetch_news_api_async(session, semaphore, ticker, days),
+            self._fetch_finnhub_async(session, semaphore, ticker, days),
+            # yfinance has no async API, run it in a worker thread
+            loop.run_in_executor(None, self.collect_yfinance_news, ticker),
+        )
+
+        all_articles = [article for source_articles in results for article in source_articles]
+        return self._merge_articles(all_articles, max_articles)
+
+    def _get_async_session(self) -> aiohttp.ClientSession:
+        """Return the collector's aiohttp session, so keep-alive connections are reused"""
+        loop = asyncio.get_running_loop()
+        if (
+            self._async_session is None
+            or self._async_session.closed
+            or self._async_session_loop is not loop
+        ):
+            self._async_session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=10),
+                connector=aiohttp.TCPConnector(limit=MAX_CONCURRENT_REQUESTS * 2),
+            )
+            self._async_session_loop = loop
+        return self._async_session
+
+    async def aclose(self) -> None:
+        """Close the aiohttp session used by collect_all_async"""
+        if self._async_session is not None and not self._async_session.closed:
+            await self._async_session.close()
+        self._async_session = None
+
+    async def _fetch_json_async(
+        self,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        url: str,
+        params: Dict[str, Any],
+    ) -> Any:
+        """GET a JSON document, bounded by the shared semaphore and retried like self.session"""
+        for attempt in range(MAX_RETRIES + 1):
+            if attempt:
+                await asyncio.sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
+            try:
+                async with semaphore:
+                    async with session.get(url, params=params) as response:
+                        if response.status in RETRY_STATUSES and attempt < MAX_RETRIES:
+                            logger.warning(f"Retrying {url} after HTTP {response.status}")
+                            continue
+                        response.raise_for_status()
+                        return orjson.loads(await response.read())
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt == MAX_RETRIES:
+                    raise
+                logger.warning(f"Retrying {url} after {e!r}")
+
+    async def _fetch_news_api_async(
+        self,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        ticker: str,
+        days: int,
+    ) -> List[Dict[str, Any]]:
+        """Async counterpart of collect_news_api"""
+        if not self.news_api_key:
+            logger.error("NEWS_API_KEY not found in environment")
+            return []
+
+        params = self._news_api_params(ticker, days)
+        cache_key = f"{ticker}:{params['from']}:{params['to']}"
+        # FileCache does blocking disk I/O, keep it off the event loop
+        cached = await asyncio.to_thread(self._get_cached_articles, "newsapi", cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            data = await self._fetch_json_async(session, semaphore, NEWS_API_URL, params)
+            articles = self._parse_news_api(data)
+            logger.info(f"Collected {len(articles)} articles from NewsAPI for {ticker}")
+            await asyncio.to_thread(
+                self._cache_articles, "newsapi", cache_key, articles, params["to"]
+            )
+            return articles
+        except (aiohttp.ClientError, asyncio.TimeoutError, orjson.JSONDecodeError) as e:
+            logger.error(f"Error fetching from NewsAPI: {e}")
+            return []
+
+    async def _fetch_finnhub_async(
+        self,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        ticker: str,
+        days: int,
+    ) -> List[Dict[str, Any]]:
+        """Async counterpart of collect_finnhub"""
+        if not self.finnhub_key:
+            logger.error("FINNHUB_API_KEY not found in environment")
+            return []
+
+        params = self._finnhub_params(ticker, days)
+        cache_key = f"{ticker}:{params['from']}:{params['to']}"
+        cached = await asyncio.to_thread(self._get_cached_articles, "finnhub", cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            data = await self._fetch_json_async(session, semaphore, FINNHUB_URL, params)
+            articles = self._parse_finnhub(data)
+            logger.info(f"Collected {len(articles)} articles from Finnhub for {ticker}")
+            await asyncio.to_thread(
+                self._cache_articles, "finnhub", cache_key, articles, params["to"]
+            )
+            return articles
+        except (aiohttp.ClientError, asyncio.TimeoutError, orjson.JSONDecodeError) as e:
+            logger.error(f"Error fetching from Finnhub: {e}")
+            return []
+
+    def _get_cached_articles(self, source: str, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return cached articles for a source query, or None on a miss"""
+        if self.cache is None:
+            return None
+
+        articles = self.cache.get(source, key)
+        if articles is not None:
+            logger.info(f"Using {len(articles)} cached {source} articles for {key}")
+        return articles
+
+    def _cache_articles(
+        self,
+        source: str,
+        key: str,
+        articles: List[Dict[str, Any]],
+        end_date: Optional[str] = None,
+    ) -> None:
+        """
+        Cache the articles of a successful source query
+        Args:
+            source: Source name, used as the cache namespace
+            key: Query key
+            articles: Parsed articles
+            end_date: Last day of the queried range (YYYY-MM-DD), if the query has one
+        """
+        if self.cache is None:
+            return
+
+        today = datetime.now().strftime("%Y-%m-%d")
+        ttl = PAST_NEWS_CACHE_TTL if end_date and end_date < today else NEWS_CACHE_TTL
+        self.cache.set(source, key, articles, ttl)
+
+    def _merge_articles(
+        self, all_articles: List[Dict[str, Any]], max_articles: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Deduplicate, sort and limit articles from all sources
+        Args:
+            all_articles: Articles from all sources
+            max_articles: Maximum number of articles to return
+        Returns:
+            Unique articles, newest first
+        """
+        # Remove duplicates based on the normalized title prefix, so punctuation and
+        # spacing differences between sources ("Apple Inc." / "Apple Inc") still match.
+        # Titles made only of punctuation fall back to the raw title, then the URL
+        seen_keys = set()
         unique_articles = []
         for article in all_articles:
-            title = article.get("title", "").lower()
-            if title and title not in seen_titles:
-                seen_titles.add(title)
+            title = (article.get("title") or "").casefold()
+            normalized = _NON_WORD.sub("", title)[:TITLE_KEY_LENGTH]
+            normalized = normalized or title.strip() or article.get("url") or ""
+            key = hash(normalized)
+            if normalized and key not in seen_keys:
+                seen_keys.add(key)
                 unique_articles.append(article)
 
-        # Sort by date (newest first)
-        unique_articles.sort(key=lambda x: x.get("published_at", ""), reverse=True)
-
-        # Limit to max_articles
-        result = unique_articles[:max_articles]
+        # Newest max_articles articles, without sorting the rest
+        result = heapq.nlargest(
+            max_articles, unique_articles, key=lambda x: x.get("published_at") or ""
+        )
 
         logger.info(f"Total unique articles collected: {len(result)}")
         return result
@@ -0,0 +1,38 @@
+import re
+
+# Compact financial sentiment word list in the spirit of the Loughran-McDonald lexicon.
+# Used only to decide whether an article is worth a FinBERT pass, not to score it.
+POSITIVE_TERMS = frozenset("""
+    achieve achieved advance advanced advances beat beats bullish boost boosted boosts
+    breakthrough climb climbed climbs exceed exceeded exceeds expand expanded expansion
+    gain gained gains grew grow growing growth high higher highs improve improved improvement
+    improves jump jumped jumps outperform outperformed outperforms optimistic positive profit
+    profitable profits rally rallied rallies rebound rebounded record recover recovered
+    recovery rise rises rising rose soar soared soars strong stronger strength surge surged
+    surges upbeat upgrade upgraded upgrades win wins
+    """.split())
+
+NEGATIVE_TERMS = frozenset("""
+    bankrupt bankruptcy bearish concern concerns crash crashed cut cuts decline declined
+    declines decrease decreased default deficit delay delayed downgrade downgraded downgrades
+    drop dropped drops fail failed failure fall fallen falling falls fell fined fraud
+    investigation lawsuit layoff layoffs lose loses losing loss losses low lower lows miss
+    missed misses negative plunge plunged plunges recall recession risk risks selloff
+    shortfall slump slumped slumps sink sinks slowdown tumble tumbled tumbles warn warned
+    warning weak weaker weakness worse worst
+    """.split())
+
+SENTIMENT_TERMS = POSITIVE_TERMS | NEGATIVE_TERMS
+
+_WORD_RE = re.compile(r"[a-z]+")
+
+
+def has_sentiment_terms(text: str) -> bool:
+    """
+    Check whether a text contains any sentiment-bearing financial term
+    Args:
+        text: Input text
+    Returns:
+        True if at least one lexicon term occurs as a whole word
+    """
+    return not SENTIMENT_TERMS.isdisjoint(_WORD_RE.findall(text.lower()))
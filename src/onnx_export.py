@@ -0,0 +1,108 @@
+import argparse
+import logging
+import os
+import re
+import tempfile
+from pathlib import Path
+
+import torch
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ONNX_DIR = "models/finbert-onnx"
+ONNX_FP32_NAME = "finbert.onnx"
+ONNX_INT8_NAME = "finbert-int8.onnx"
+
+
+def model_artifact_dir(base_dir: str, model_name: str) -> Path:
+    """
+    Directory for a model's exported or quantized files, one per model under base_dir
+    Args:
+        base_dir: Directory shared by all models (e.g. DEFAULT_ONNX_DIR)
+        model_name: Hugging Face model name or local path
+    Returns:
+        Path such as models/finbert-onnx/ProsusAI--finbert
+    """
+    return Path(base_dir) / re.sub(r"[^\w.-]+", "--", model_name).strip("-")
+
+
+def export_finbert(
+    model_name: str = "ProsusAI/finbert", output_dir: str = DEFAULT_ONNX_DIR, opset: int = 17
+) -> Path:
+    """
+    Export FinBERT to ONNX and quantize the weights to INT8
+    Args:
+        model_name: Hugging Face model name
+        output_dir: Base directory; files go to the model's subdirectory (model_artifact_dir)
+        opset: ONNX opset version
+    Returns:
+        Path to the quantized ONNX model
+    """
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    output_path = model_artifact_dir(output_dir, model_name)
+    output_path.mkdir(parents=True, exist_ok=True)
+    int8_path = output_path / ONNX_INT8_NAME
+
+    logger.info(f"Exporting {model_name} to ONNX")
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name)
+    model.eval()
+
+    dummy = tokenizer(["StockSentinel export"], return_tensors="pt")
+    input_names = list(dummy.keys())
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["logits"] = {0: "batch"}
+
+    # Build everything in a private directory so concurrent exports (e.g. several
+    # inference workers starting at once) never see each other's partial files
+    with tempfile.TemporaryDirectory(dir=output_path) as tmp_dir:
+        tmp_path = Path(tmp_dir)
+
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                (dict(dummy),),
+                str(tmp_path / ONNX_FP32_NAME),
+                input_names=input_names,
+                output_names=["logits"],
+                dynamic_axes=dynamic_axes,
+                opset_version=opset,
+                dynamo=False,
+            )
+
+        logger.info("Quantizing ONNX model to INT8")
+        quantize_dynamic(
+            str(tmp_path / ONNX_FP32_NAME),
+            str(tmp_path / ONNX_INT8_NAME),
+            weight_type=QuantType.QInt8,
+        )
+        tokenizer.save_pretrained(tmp_path)
+
+        # The INT8 model is moved last, its presence marks a complete export
+        for file in sorted(tmp_path.iterdir(), key=lambda f: f.name == ONNX_INT8_NAME):
+            os.replace(file, output_path / file.name)
+
+    logger.info(f"Saved quantized ONNX model to {int8_path}")
+    return int8_path
+
+
+def main():
+    """Export entry point"""
+    parser = argparse.ArgumentParser(description="Export FinBERT to a quantized ONNX model")
+    parser.add_argument("--model", type=str, default="ProsusAI/finbert", help="Model name")
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        default=DEFAULT_ONNX_DIR,
+        help=f"Output directory (default: {DEFAULT_ONNX_DIR})",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    export_finbert(args.model, args.output_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,40 +1,327 @@
+import hashlib
+import json
 import logging
-from typing import Dict, List, Any
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+import redis
 import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from transformers import AutoConfig, AutoTokenizer, AutoModelForSequenceClassification
 import numpy as np
 
-from .utils import clean_text, calculate_sentiment_score
+from .lexicon import has_sentiment_terms
+from .onnx_export import DEFAULT_ONNX_DIR, ONNX_INT8_NAME, export_finbert, model_artifact_dir
+from .utils import calculate_sentiment_scores, clean_texts_fast, get_sentiment_labels
+
+try:
+    import onnxruntime as ort
+except ImportError:  # pragma: no cover - optional dependency
+    ort = None
 
 logger = logging.getLogger(__name__)
 
 
+def _default_num_threads() -> int:
+    """Split the CPU cores between server and inference worker processes"""
+    workers = int(os.getenv("WEB_CONCURRENCY", "1")) * int(os.getenv("INFERENCE_WORKERS", "1"))
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+# Intra-op threads per process; set TORCH_THREADS to override
+NUM_THREADS = int(os.getenv("TORCH_THREADS", _default_num_threads()))
+torch.set_num_threads(NUM_THREADS)
+try:
+    torch.set_num_interop_threads(1)
+except RuntimeError:
+    # Can only be set before the first parallel op in the process
+    pass
+
+# Texts per forward pass; batches are length-sorted so each one pads to similar lengths
+DEFAULT_BATCH_SIZE = 32
+
+# Texts are cut to max_length * MAX_CHARS_PER_TOKEN characters before tokenizing. English news
+# averages ~4 characters per token, so at 8 the cut stays beyond the tokenizer's own truncation
+# and only skips tokenizing text that would be dropped anyway
+MAX_CHARS_PER_TOKEN = 8
+
+
 class SentimentAnalyzer:
     """Analyze sentiment of financial news using AI models"""
 
-    def __init__(self, model_name: str = "ProsusAI/finbert"):
+    def __init__(
+        self,
+        model_name: str = "ProsusAI/finbert",
+        quantize: Optional[bool] = None,
+        quantized_dir: str = "models/finbert-int8",
+        onnx_dir: str = DEFAULT_ONNX_DIR,
+        export_onnx: bool = True,
+        redis_url: Optional[str] = None,
+        max_length: int = 256,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        prefilter: Optional[bool] = None,
+    ):
         """
         Initialize sentiment analyzer
         Args:
             model_name: Hugging Face model name (default: FinBERT)
+            quantize: Use dynamic INT8 quantization of the Linear layers on CPU
+                (default: on, unless FINBERT_QUANTIZE=0)
+            quantized_dir: Directory holding saved quantized models, one subdirectory per model
+            onnx_dir: Directory holding exported INT8 ONNX models, one subdirectory per model
+                (see src/onnx_export.py)
+            export_onnx: Export the ONNX model on first use when it's missing
+            redis_url: Redis URL for the per-article sentiment cache (default: REDIS_URL)
+            max_length: Maximum tokens per text (title + description rarely need more)
+            batch_size: Default number of texts per forward pass
+            prefilter: Score texts without any financial sentiment term as neutral instead of
+                running FinBERT (default: off, unless FINBERT_PREFILTER=1)
         """
         self.model_name = model_name
+        self.max_length = max_length
+        self.batch_size = batch_size
+        if prefilter is None:
+            prefilter = os.getenv("FINBERT_PREFILTER", "0") == "1"
+        self.prefilter = prefilter
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        if quantize is None:
+            quantize = os.getenv("FINBERT_QUANTIZE", "1") != "0"
+        self.quantized = quantize and self.device == "cpu"
+        self.session = None
+        self.model = None
         logger.info(f"Using device: {self.device}")
 
+        # Saved artifacts are keyed by model name, so another model never loads FinBERT's files
+        # (and never caches FinBERT's sentiments under its own name)
+        onnx_path = model_artifact_dir(onnx_dir, model_name) / ONNX_INT8_NAME
+        if self.quantized and ort is not None and export_onnx and not onnx_path.exists():
+            self._export_onnx(onnx_dir)
+
         try:
             logger.info(f"Loading model: {model_name}")
-            self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-            self.model = AutoModelForSequenceClassification.from_pretrained(model_name)
-            self.model.to(self.device)
-            self.model.eval()
-            logger.info("FinBERT model loaded successfully")
+            if self.quantized and ort is not None and onnx_path.exists():
+                self.tokenizer = AutoTokenizer.from_pretrained(onnx_path.parent)
+                self.session = self._create_onnx_session(onnx_path)
+            elif self.quantized:
+                self.tokenizer, self.model = self._load_quantized_model(
+                    model_artifact_dir(quantized_dir, model_name)
+                )
+            else:
+                self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+                self.model = AutoModelForSequenceClassification.from_pretrained(model_name)
+
+            if self.model is not None:
+                self.model.to(self.device)
+                self.model.eval()
+                if self.device == "cuda":
+                    self.model = self._optimize_for_cuda(self.model)
+            self.backend = "onnx" if self.session is not None else "torch"
+            logger.info(f"FinBERT model loaded successfully (backend: {self.backend})")
         except Exception as e:
             logger.error(f"Error loading FinBERT model: {e}")
             raise RuntimeError(
                 "Failed to load FinBERT model. Please check your internet connection."
             )
 
+        # Optional per-article sentiment cache, so only new articles hit the model
+        redis_url = redis_url or os.getenv("REDIS_URL")
+        self.cache = redis.Redis.from_url(redis_url, decode_responses=True) if redis_url else None
+        self.cache_ttl = int(os.getenv("SENTIMENT_CACHE_TTL", "86400"))
+
+    def _load_quantized_model(self, quantized_dir: Path):
+        """
+        Load the INT8 quantized model, quantizing and saving it on first use
+        Args:
+            quantized_dir: Directory with config, tokenizer and quantized weights
+        Returns:
+            Tuple of (tokenizer, quantized model)
+        """
+        weights_path = quantized_dir / "model_int8.pt"
+
+        if weights_path.exists():
+            logger.info(f"Loading quantized model from {quantized_dir}")
+            tokenizer = AutoTokenizer.from_pretrained(quantized_dir)
+            config = AutoConfig.from_pretrained(quantized_dir)
+            model = AutoModelForSequenceClassification.from_config(config)
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+            model.load_state_dict(torch.load(weights_path))
+            return tokenizer, model
+
+        tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        model = AutoModelForSequenceClassification.from_pretrained(self.model_name)
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+        # Save config, tokenizer and weights so later starts skip download and quantization
+        quantized_dir.mkdir(parents=True, exist_ok=True)
+        model.config.save_pretrained(quantized_dir)
+        tokenizer.save_pretrained(quantized_dir)
+        torch.save(model.state_dict(), weights_path)
+        logger.info(f"Saved quantized model to {quantized_dir}")
+
+        return tokenizer, model
+
+    def _optimize_for_cuda(self, model):
+        """
+        Cast the model to half precision and compile it with fused kernels
+        Set TORCH_COMPILE=0 to skip compilation (e.g. to avoid its start-up cost)
+        Args:
+            model: FinBERT model on the GPU
+        Returns:
+            Optimized model
+        """
+        dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+        model = model.to(dtype)
+        logger.info(f"Running FinBERT in {dtype}")
+
+        if os.getenv("TORCH_COMPILE", "1") == "1":
+            # Length-bucketed batches vary in both batch size and sequence length; CUDA graphs
+            # ("reduce-overhead") are recorded per shape and would keep recompiling, so compile
+            # once with dynamic shapes instead
+            model = torch.compile(model, dynamic=True)
+            logger.info("Compiled FinBERT with torch.compile")
+        return model
+
+    def _export_onnx(self, onnx_dir: str) -> None:
+        """Export the INT8 ONNX model once; on failure the PyTorch backend is used"""
+        try:
+            export_finbert(self.model_name, onnx_dir)
+        except Exception as e:
+            logger.warning(f"ONNX export failed, using PyTorch instead: {e}")
+
+    def _create_onnx_session(self, onnx_path: Path):
+        """
+        Create an ONNX Runtime CPU session for the quantized model
+        Args:
+            onnx_path: Path to the INT8 ONNX model
+        Returns:
+            ONNX Runtime inference session
+        """
+        sess_options = ort.SessionOptions()
+        sess_options.intra_op_num_threads = NUM_THREADS
+        sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+        logger.info(f"Loading ONNX model from {onnx_path}")
+        session = ort.InferenceSession(
+            str(onnx_path), sess_options=sess_options, providers=["CPUExecutionProvider"]
+        )
+        self._onnx_inputs = {node.name for node in session.get_inputs()}
+        return session
+
+    def _predict_probs(self, texts: List[str], batch_size: int) -> np.ndarray:
+        """
+        Run FinBERT on texts in length-sorted batches, so short texts aren't padded to long ones
+        Args:
+            texts: Cleaned input texts
+            batch_size: Number of texts per forward pass
+        Returns:
+            Array of shape [len(texts), 3] with [positive, negative, neutral] probabilities
+        """
+        if not texts:
+            return np.empty((0, 3), dtype=np.float32)
+
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        batches = [
+            [texts[i] for i in order[start : start + batch_size]]
+            for start in range(0, len(order), batch_size)
+        ]
+        if len(batches) == 1:
+            sorted_probs = self._forward(batches[0])
+        else:
+            sorted_probs = np.concatenate(self._forward_pipelined(batches))
+
+        # Scatter back to input order
+        probs = np.empty_like(sorted_probs)
+        probs[order] = sorted_probs
+        return probs
+
+    def _forward_pipelined(self, batches: List[List[str]]) -> List[np.ndarray]:
+        """
+        Run batches while the next one is tokenized on a background thread
+        The fast tokenizer, PyTorch and ONNX Runtime all release the GIL, so both overlap.
+        Args:
+            batches: Lists of cleaned input texts
+        Returns:
+            Probability arrays, one per batch
+        """
+        outputs = []
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="tokenizer") as executor:
+            pending = executor.submit(self._tokenize, batches[0])
+            for next_batch in batches[1:] + [None]:
+                inputs = pending.result()
+                if next_batch is not None:
+                    pending = executor.submit(self._tokenize, next_batch)
+                outputs.append(self._run(inputs))
+        return outputs
+
+    def _forward(self, texts: List[str]) -> np.ndarray:
+        """
+        Run a single FinBERT forward pass, padding to the longest text in the batch
+        Args:
+            texts: Cleaned input texts
+        Returns:
+            Array of shape [len(texts), 3] with [positive, negative, neutral] probabilities
+        """
+        return self._run(self._tokenize(texts))
+
+    def _tokenize(self, texts: List[str]) -> Dict[str, Any]:
+        """
+        Tokenize a batch for the active backend
+        Args:
+            texts: Cleaned input texts
+        Returns:
+            ONNX Runtime feed of int64 arrays, or tensors (pinned on CUDA for async copies)
+        """
+        if self.session is not None:
+            inputs = self.tokenizer(
+                texts,
+                return_tensors="np",
+                truncation=True,
+                max_length=self.max_length,
+                padding="longest",
+            )
+            return {k: v.astype(np.int64) for k, v in inputs.items() if k in self._onnx_inputs}
+
+        inputs = self.tokenizer(
+            texts,
+            return_tensors="pt",
+            truncation=True,
+            max_length=self.max_length,
+            padding="longest",
+        )
+        if self.device == "cuda":
+            return {k: v.pin_memory() for k, v in inputs.items()}
+        return dict(inputs)
+
+    @torch.inference_mode()
+    def _run(self, inputs: Dict[str, Any]) -> np.ndarray:
+        """
+        Run the model on tokenized inputs
+        Args:
+            inputs: Output of _tokenize
+        Returns:
+            Array of shape [batch, 3] with [positive, negative, neutral] probabilities
+        """
+        if self.session is not None:
+            logits = self.session.run(None, inputs)[0]
+        else:
+            inputs = {k: v.to(self.device, non_blocking=True) for k, v in inputs.items()}
+            logits = self.model(**inputs).logits.float().cpu().numpy()
+
+        exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+        return exp / exp.sum(axis=-1, keepdims=True)
+
+    def warmup(self, batch_size: int = 8) -> None:
+        """
+        Run dummy forward passes so the first real request avoids one-time setup costs
+        Args:
+            batch_size: Number of max-length texts in the warm-up batch
+        """
+        long_text = " ".join(["warmup"] * self.max_length)
+        self._predict_probs([long_text] * batch_size, batch_size)
+        self._predict_probs(["warmup"], batch_size)
+        logger.info("FinBERT warm-up complete")
+
     def analyze_with_finbert(self, text: str) -> Dict[str, float]:
         """
         Analyze sentiment using FinBERT
@@ -43,83 +330,164 @@ class SentimentAnalyzer:
         Returns:
             Dictionary with sentiment scores
         """
-        text = clean_text(text)
-        if not text:
-            return {"positive": 0.0, "negative": 0.0, "neutral": 1.0, "score": 0.0}
+        return self.analyze_texts([text])[0]
 
-        try:
-            # Tokenize and predict
-            inputs = self.tokenizer(
-                text, return_tensors="pt", truncation=True, max_length=512, padding=True
-            ).to(self.device)
+    def analyze_texts(
+        self, texts: List[str], batch_size: Optional[int] = None
+    ) -> List[Dict[str, float]]:
+        """
+        Analyze sentiment of multiple texts in batched FinBERT forward passes
+        Args:
+            texts: Input texts
+            batch_size: Texts per forward pass (default: the analyzer's batch_size)
+        Returns:
+            List of dictionaries with sentiment scores, in input order
+        """
+        results = [{"positive": 0.0, "negative": 0.0, "neutral": 1.0, "score": 0.0} for _ in texts]
+
+        max_chars = self.max_length * MAX_CHARS_PER_TOKEN
+        cleaned = [text[:max_chars] for text in clean_texts_fast(texts)]
+        indices = [i for i, text in enumerate(cleaned) if text]
+        if self.prefilter:
+            # Boilerplate without sentiment-bearing words stays neutral
+            indices = [i for i in indices if has_sentiment_terms(cleaned[i])]
+        if not indices:
+            return results
 
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-                predictions = torch.nn.functional.softmax(outputs.logits, dim=-1)
+        cached = self._get_cached_sentiments([cleaned[i] for i in indices])
+        for i, sentiment in zip(indices, cached):
+            if sentiment is not None:
+                results[i] = sentiment
 
+        misses = [i for i, sentiment in zip(indices, cached) if sentiment is None]
+        if not misses:
+            return results
+
+        try:
             # FinBERT outputs: [positive, negative, neutral]
-            probs = predictions[0].cpu().numpy()
+            probs = self._predict_probs([cleaned[i] for i in misses], batch_size or self.batch_size)
 
-            return {
-                "positive": float(probs[0]),
-                "negative": float(probs[1]),
-                "neutral": float(probs[2]),
-                "score": calculate_sentiment_score(
-                    float(probs[0]), float(probs[1]), float(probs[2])
-                ),
-            }
+            scores = calculate_sentiment_scores(probs[:, 0], probs[:, 1])
+
+            for i, (positive, negative, neutral), score in zip(
+                misses, probs.tolist(), scores.tolist()
+            ):
+                results[i] = {
+                    "positive": positive,
+                    "negative": negative,
+                    "neutral": neutral,
+                    "score": score,
+                }
+
+            self._set_cached_sentiments({cleaned[i]: results[i] for i in misses})
 
         except Exception as e:
             logger.error(f"Error in FinBERT analysis: {e}")
-            return {"positive": 0.0, "negative": 0.0, "neutral": 1.0, "score": 0.0}
 
-    def analyze_article(self, article: Dict[str, Any]) -> Dict[str, Any]:
+        return results
+
+    def _cache_key(self, text: str) -> str:
+        """Build the sentiment cache key for a cleaned text"""
+        digest = hashlib.sha1(f"{self.model_name}\n{text}".encode("utf-8")).hexdigest()
+        return f"article:sent:{digest}"
+
+    def _get_cached_sentiments(self, texts: List[str]) -> List[Optional[Dict[str, float]]]:
         """
-        Analyze sentiment of a single article using FinBERT
+        Look up cached sentiments for cleaned texts
         Args:
-            article: Article dictionary with 'title', 'description', 'content'
+            texts: Cleaned input texts
         Returns:
-            Article with added sentiment analysis
+            Cached sentiment per text, or None for misses
         """
-        # Combine title and description for analysis
-        text = f"{article.get('title', '')} {article.get('description', '')}"
+        if self.cache is None:
+            return [None] * len(texts)
+
+        try:
+            values = self.cache.mget([self._cache_key(text) for text in texts])
+        except redis.RedisError as e:
+            logger.warning(f"Sentiment cache read failed: {e}")
+            return [None] * len(texts)
+
+        return [json.loads(value) if value else None for value in values]
 
-        sentiment = self.analyze_with_finbert(text)
+    def _set_cached_sentiments(self, sentiments: Dict[str, Dict[str, float]]) -> None:
+        """Store sentiments for cleaned texts in the cache"""
+        if self.cache is None or not sentiments:
+            return
 
-        # Add sentiment to article
+        try:
+            pipe = self.cache.pipeline(transaction=False)
+            for text, sentiment in sentiments.items():
+                pipe.set(self._cache_key(text), json.dumps(sentiment), ex=self.cache_ttl)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Sentiment cache write failed: {e}")
+
+    @staticmethod
+    def get_article_text(article: Dict[str, Any]) -> str:
+        """Combine title and description into the text used for analysis"""
+        return " ".join(filter(None, (article.get("title"), article.get("description"))))
+
+    @staticmethod
+    def attach_sentiment(
+        article: Dict[str, Any], sentiment: Dict[str, float], label: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Add sentiment scores and label to a copy of an article
+        Args:
+            article: Article dictionary
+            sentiment: Sentiment scores from FinBERT
+            label: Precomputed sentiment label (default: derived from the score)
+        Returns:
+            Article with added sentiment analysis
+        """
         article_with_sentiment = article.copy()
         article_with_sentiment["sentiment"] = sentiment
-        article_with_sentiment["sentiment_label"] = self._get_label(sentiment["score"])
+        article_with_sentiment["sentiment_label"] = label or SentimentAnalyzer._get_label(
+            sentiment["score"]
+        )
 
         return article_with_sentiment
 
-    def analyze_articles(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def analyze_article(self, article: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Analyze sentiment of a single article using FinBERT
+        Args:
+            article: Article dictionary with 'title', 'description', 'content'
+        Returns:
+            Article with added sentiment analysis
+        """
+        sentiment = self.analyze_with_finbert(self.get_article_text(article))
+        return self.attach_sentiment(article, sentiment)
+
+    def analyze_articles(
+        self, articles: List[Dict[str, Any]], batch_size: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
         """
         Analyze sentiment of multiple articles using FinBERT
         Args:
             articles: List of article dictionaries
+            batch_size: Articles per forward pass (default: the analyzer's batch_size)
         Returns:
             Articles with sentiment analysis added
         """
         logger.info(f"Analyzing {len(articles)} articles using FinBERT")
 
-        analyzed_articles = []
-        for i, article in enumerate(articles):
-            try:
-                analyzed = self.analyze_article(article)
-                analyzed_articles.append(analyzed)
-
-                if (i + 1) % 10 == 0:
-                    logger.info(f"Analyzed {i + 1}/{len(articles)} articles")
-
-            except Exception as e:
-                logger.error(f"Error analyzing article {i}: {e}")
-                continue
+        # Run all articles through FinBERT in batches
+        sentiments = self.analyze_texts(
+            [self.get_article_text(article) for article in articles], batch_size
+        )
+        labels = self._get_labels([sentiment["score"] for sentiment in sentiments])
+        analyzed_articles = [
+            self.attach_sentiment(article, sentiment, label)
+            for article, sentiment, label in zip(articles, sentiments, labels)
+        ]
 
         logger.info(f"Successfully analyzed {len(analyzed_articles)} articles")
         return analyzed_articles
 
-    def get_aggregated_sentiment(self, articles: List[Dict[str, Any]]) -> Dict[str, Any]:
+    @staticmethod
+    def get_aggregated_sentiment(articles: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Calculate aggregated sentiment from multiple articles
         Args:
@@ -138,41 +506,44 @@ class SentimentAnalyzer:
                 "overall_label": "neutral",
             }
 
-        scores = []
-        positive_count = 0
-        negative_count = 0
-        neutral_count = 0
-
-        for article in articles:
-            sentiment = article.get("sentiment", {})
-            score = sentiment.get("score", 0.0)
-            scores.append(score)
-
-            label = article.get("sentiment_label", "neutral")
-            if label == "bullish":
-                positive_count += 1
-            elif label == "bearish":
-                negative_count += 1
-            else:
-                neutral_count += 1
-
-        mean_score = np.mean(scores)
         total = len(articles)
+        scores = np.fromiter(
+            (article.get("sentiment", {}).get("score", 0.0) for article in articles),
+            dtype=np.float64,
+            count=total,
+        )
+        label_counts = Counter(article.get("sentiment_label", "neutral") for article in articles)
+        positive_count = label_counts["bullish"]
+        negative_count = label_counts["bearish"]
+        mean_score = float(scores.mean())
 
         return {
-            "mean_score": float(mean_score),
+            "mean_score": mean_score,
             "median_score": float(np.median(scores)),
-            "std_score": float(np.std(scores)),
-            "min_score": float(np.min(scores)),
-            "max_score": float(np.max(scores)),
+            "std_score": float(scores.std()),
+            "min_score": float(scores.min()),
+            "max_score": float(scores.max()),
             "positive_ratio": positive_count / total,
             "negative_ratio": negative_count / total,
-            "neutral_ratio": neutral_count / total,
+            "neutral_ratio": (total - positive_count - negative_count) / total,
             "article_count": total,
-            "overall_label": self._get_label(mean_score),
+            "overall_label": SentimentAnalyzer._get_label(mean_score),
         }
 
-    def _get_label(self, score: float, threshold: float = 0.3) -> str:
+    @staticmethod
+    def _get_labels(scores: List[float], threshold: float = 0.3) -> List[str]:
+        """
+        Convert a batch of sentiment scores to labels in one vectorized step
+        Args:
+            scores: Sentiment scores
+            threshold: Classification threshold, same semantics as _get_label
+        Returns:
+            List of "bullish", "neutral", or "bearish"
+        """
+        return get_sentiment_labels(scores, threshold)
+
+    @staticmethod
+    def _get_label(score: float, threshold: float = 0.3) -> str:
         """
         Convert sentiment score to label
         Args:
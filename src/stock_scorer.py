@@ -1,18 +1,36 @@
+import bisect
+import heapq
 import logging
-from typing import Dict, List, Any
+import threading
+from typing import Dict, List, Any, Optional
 from datetime import datetime
-import yfinance as yf
+from cachetools import TTLCache
+import numpy as np
 
+from .cache import DEFAULT_CACHE_DIR, FileCache
 from .utils import format_ticker
+from .yf_pool import get_ticker
 
 logger = logging.getLogger(__name__)
 
+# Company metadata rarely changes; quotes go stale within minutes
+STATIC_INFO_TTL = 30 * 86400
+QUOTE_TTL = 300
+
+# Lower score bounds (inclusive) of each recommendation above STRONG SELL
+RECOMMENDATION_THRESHOLDS = (30, 40, 45, 55, 60, 70)
+RECOMMENDATIONS = ("STRONG SELL", "SELL", "WEAK SELL", "HOLD", "WEAK BUY", "BUY", "STRONG BUY")
+
 
 class StockScorer:
     """Generate stock scores and recommendations based on sentiment and other factors"""
 
-    def __init__(self):
-        """Initialize StockScorer"""
+    def __init__(self, cache_dir: Optional[str] = DEFAULT_CACHE_DIR):
+        """
+        Initialize StockScorer
+        Args:
+            cache_dir: Directory for the on-disk company info cache (None disables it)
+        """
         self.weights = {
             "sentiment_score": 0.70,  # Main Factor: Sentiment
             "sentiment_consistency": 0.15,  # Only relevant with enough articles
@@ -20,6 +38,9 @@ class StockScorer:
             "recency": 0.05,  # Minimal influence because default value of days is 7
         }
         self.min_articles_for_consistency = 10
+        self.info_cache = FileCache(cache_dir) if cache_dir else None
+        self._quotes = TTLCache(maxsize=512, ttl=QUOTE_TTL)
+        self._quotes_lock = threading.Lock()
 
     def calculate_score(
         self, aggregated_sentiment: Dict[str, Any], articles: List[Dict[str, Any]]
@@ -135,28 +156,29 @@ class StockScorer:
         if not articles:
             return 0.0
 
-        now = datetime.now()
-        recency_scores = []
-
-        for article in articles:
-            try:
-                pub_date = datetime.fromisoformat(
-                    article.get("published_at", "").replace("Z", "+00:00")
-                )
-                hours_ago = (now - pub_date).total_seconds() / 3600
-
-                if hours_ago < 24:
-                    recency_scores.append(0.5)
-                elif hours_ago < 48:
-                    recency_scores.append(0.2)
-                elif hours_ago < 96:
-                    recency_scores.append(0.0)
-                else:
-                    recency_scores.append(-0.2)
-            except:
-                recency_scores.append(0.0)
-
-        return sum(recency_scores) / len(recency_scores) if recency_scores else 0.0
+        # published_at is normalized to UTC by the collector, so the offset can be dropped
+        stamps = [(article.get("published_at") or "")[:19] for article in articles]
+        try:
+            pub_dates = np.array(stamps, dtype="datetime64[s]")
+        except ValueError:
+            pub_dates = np.array([self._to_datetime64(s) for s in stamps], dtype="datetime64[s]")
+
+        hours_ago = (np.datetime64("now", "s") - pub_dates) / np.timedelta64(1, "h")
+        recency_scores = np.select(
+            [np.isnan(hours_ago), hours_ago < 24, hours_ago < 48, hours_ago < 96],
+            [0.0, 0.5, 0.2, 0.0],
+            default=-0.2,
+        )
+
+        return float(recency_scores.mean())
+
+    @staticmethod
+    def _to_datetime64(timestamp: str) -> np.datetime64:
+        """Parse an ISO timestamp, returning NaT if it's invalid"""
+        try:
+            return np.datetime64(timestamp, "s")
+        except ValueError:
+            return np.datetime64("NaT", "s")
 
     def _generate_recommendation(self, score: float, aggregated: Dict[str, Any]) -> str:
         """
@@ -167,20 +189,7 @@ class StockScorer:
         Returns:
             Recommendation string
         """
-        if score >= 70:
-            return "STRONG BUY"
-        elif score >= 60:
-            return "BUY"
-        elif score >= 55:
-            return "WEAK BUY"
-        elif score >= 45:
-            return "HOLD"
-        elif score >= 40:
-            return "WEAK SELL"
-        elif score >= 30:
-            return "SELL"
-        else:
-            return "STRONG SELL"
+        return RECOMMENDATIONS[bisect.bisect_right(RECOMMENDATION_THRESHOLDS, score)]
 
     def _calculate_confidence(self, aggregated: Dict[str, Any], article_count: int) -> str:
         """
@@ -229,19 +238,15 @@ class StockScorer:
         ticker = format_ticker(ticker)
 
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
+            static_info = self._get_static_info(ticker)
+            quote = self._get_quote(ticker)
 
             return {
                 "ticker": ticker,
-                "company_name": info.get("longName", ticker),
-                "sector": info.get("sector", "Unknown"),
-                "industry": info.get("industry", "Unknown"),
-                "market_cap": info.get("marketCap"),
-                "current_price": info.get("currentPrice"),
-                "previous_close": info.get("previousClose"),
+                **static_info,
+                **quote,
                 "day_change_percent": self._calculate_change_percent(
-                    info.get("currentPrice"), info.get("previousClose")
+                    quote["current_price"], quote["previous_close"]
                 ),
             }
         except Exception as e:
@@ -253,6 +258,53 @@ class StockScorer:
                 "industry": "Unknown",
             }
 
+    def _get_static_info(self, ticker: str) -> Dict[str, Any]:
+        """Get company name, sector and industry, cached on disk for 30 days"""
+        if self.info_cache is not None:
+            cached = self.info_cache.get("stock_info", ticker)
+            if cached is not None:
+                return cached
+
+        info = get_ticker(ticker).info
+        static_info = {
+            "company_name": info.get("longName", ticker),
+            "sector": info.get("sector", "Unknown"),
+            "industry": info.get("industry", "Unknown"),
+        }
+
+        # Only cache real companies, not the near-empty info of unknown tickers
+        if self.info_cache is not None and ("longName" in info or "shortName" in info):
+            self.info_cache.set("stock_info", ticker, static_info, STATIC_INFO_TTL)
+
+        # The full info includes a fresh quote, so save the separate quote request
+        with self._quotes_lock:
+            self._quotes[ticker] = {
+                "market_cap": info.get("marketCap"),
+                "current_price": info.get("currentPrice"),
+                "previous_close": info.get("previousClose"),
+            }
+
+        return static_info
+
+    def _get_quote(self, ticker: str) -> Dict[str, Any]:
+        """Get market cap, current price and previous close, cached in memory for 5 minutes"""
+        with self._quotes_lock:
+            cached = self._quotes.get(ticker)
+        if cached is not None:
+            return cached
+
+        # fast_info only requests price data, not the full info page
+        fast_info = get_ticker(ticker).fast_info
+        quote = {
+            "market_cap": fast_info.get("marketCap"),
+            "current_price": fast_info.get("lastPrice"),
+            "previous_close": fast_info.get("previousClose"),
+        }
+
+        with self._quotes_lock:
+            self._quotes[ticker] = quote
+        return quote
+
     def _calculate_change_percent(self, current: float, previous: float) -> float:
         """Calculate percentage change"""
         if not current or not previous or previous == 0:
@@ -293,13 +345,13 @@ class StockScorer:
         if not articles:
             return []
 
-        # Sort by absolute sentiment score
-        sorted_articles = sorted(
-            articles, key=lambda x: abs(x.get("sentiment", {}).get("score", 0)), reverse=True
+        # Partial sort by absolute sentiment score
+        strongest = heapq.nlargest(
+            n, articles, key=lambda x: abs(x.get("sentiment", {}).get("score", 0))
         )
 
         top_articles = []
-        for article in sorted_articles[:n]:
+        for article in strongest:
             top_articles.append(
                 {
                     "title": article.get("title", ""),
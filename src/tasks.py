@@ -0,0 +1,69 @@
+import logging
+import os
+from typing import Any, Dict, Optional
+
+from celery import Celery
+from celery.signals import worker_process_init
+
+from .data_collector import NewsCollector
+from .sentiment_analyzer import SentimentAnalyzer
+from .stock_scorer import StockScorer
+
+logger = logging.getLogger(__name__)
+
+# Redis is both the broker and the result backend unless configured otherwise
+broker_url = os.getenv("CELERY_BROKER_URL", os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+result_backend = os.getenv("CELERY_RESULT_BACKEND", broker_url)
+
+celery_app = Celery("stocksentinel", broker=broker_url, backend=result_backend)
+celery_app.conf.update(
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    result_expires=int(os.getenv("ANALYSIS_CACHE_TTL", "900")),
+    task_track_started=True,
+    # One long analysis at a time per worker process
+    worker_prefetch_multiplier=1,
+    task_acks_late=True,
+)
+
+# Pipeline components owned by a worker process (see init_worker)
+_collector: Optional[NewsCollector] = None
+_analyzer: Optional[SentimentAnalyzer] = None
+_scorer: Optional[StockScorer] = None
+
+
+@worker_process_init.connect
+def init_worker(**kwargs) -> None:
+    """Load FinBERT once per worker process, before the first task"""
+    global _collector, _analyzer, _scorer
+    _collector = NewsCollector()
+    _analyzer = SentimentAnalyzer()
+    _analyzer.warmup()
+    _scorer = StockScorer()
+
+
+@celery_app.task(name="stocksentinel.analyze")
+def analyze_task(ticker: str, days: int = 7, max_articles: int = 50) -> Dict[str, Any]:
+    """
+    Collect news, analyze sentiment and score a stock
+    Args:
+        ticker: Stock ticker symbol (already formatted and validated)
+        days: Number of days to look back
+        max_articles: Maximum number of articles
+    Returns:
+        Analysis report, same as GET /api/analyze/{ticker}
+    """
+    if _analyzer is None:
+        init_worker()
+
+    logger.info(f"Analyzing {ticker} in Celery worker, days={days}")
+    articles = _collector.collect_all(ticker, days=days, max_articles=max_articles)
+    if not articles:
+        raise ValueError(f"No news articles found for ticker {ticker}")
+
+    analyzed_articles = _analyzer.analyze_articles(articles)
+
+    aggregated = SentimentAnalyzer.get_aggregated_sentiment(analyzed_articles)
+    scoring = _scorer.calculate_score(aggregated, analyzed_articles)
+    return _scorer.generate_report(ticker, aggregated, analyzed_articles, scoring)
@@ -1,19 +1,100 @@
-import json
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Any
+import mmap
+import os
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import Dict, Iterator, List, Any, Optional, Sequence, Set
 from pathlib import Path
-import pandas as pd
-import yfinance as yf
+import numpy as np
+import orjson
+from cachetools import LRUCache
+
+from ._tickers_sp500 import KNOWN_TICKERS
+from .cache import DEFAULT_CACHE_DIR, FileCache
+
+try:
+    import hyperscan
+except ImportError:  # pragma: no cover - optional dependency
+    hyperscan = None
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None
+
+try:
+    from ciso8601 import parse_datetime as _parse_iso_datetime
+except ImportError:  # pragma: no cover - optional dependency
+
+    def _parse_iso_datetime(value: str) -> datetime:
+        """Parse an ISO 8601 string (fallback when ciso8601 is not installed)"""
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+logger = logging.getLogger(__name__)
+
+# Shared by the handlers that setup_logging installs
+_LOG_FORMATTER = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+_log_handlers: List[logging.Handler] = []
+
+# Listings rarely change, so ticker lookups are kept on disk for 90 days by default
+TICKER_CACHE_TTL = int(os.getenv("TICKER_CACHE_TTL", str(90 * 86400)))
+_ticker_cache = FileCache(DEFAULT_CACHE_DIR)
+_ticker_memo: LRUCache = LRUCache(maxsize=4096)
+_ticker_memo_lock = threading.Lock()
+# Symbols currently being looked up, so concurrent callers share one request
+_inflight: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+# Yahoo Finance quote endpoint; accepts a comma-separated list of symbols
+_QUOTE_URL = "https://query1.finance.yahoo.com/v7/finance/quote"
+TICKER_BATCH_SIZE = 20
+
+# Scores in [-1, 1] are stored as int8 multiples of 1/127 (see pack_scores)
+SCORE_SCALE = 127
+
+# One row of aggregate_sentiments_batch: the aggregate_sentiments statistics in 24 bytes
+STATS_DTYPE = np.dtype(
+    [
+        ("mean", "f4"),
+        ("median", "f4"),
+        ("std", "f4"),
+        ("min", "f4"),
+        ("max", "f4"),
+        ("count", "i4"),
+    ]
+)
+
+# Below this size, reading a JSON file is cheaper than setting up a memory map
+MMAP_MIN_BYTES = 64 * 1024
+
+# Sentiment labels indexed by label code + 1 (-1 bearish, 0 neutral, 1 bullish)
+SENTIMENT_LABELS = np.array(["bearish", "neutral", "bullish"])
+
+# Compiled once at import; clean_texts runs for every analyzed article
+_URL_RE = re.compile(r"https?://\S+")
+# Hyperscan scratch space is not thread-safe
+_hyperscan_lock = threading.Lock()
 
 
 def setup_logging(log_level: str = "INFO") -> logging.Logger:
-    """Setup logging configuration"""
-    logging.basicConfig(
-        level=getattr(logging, log_level),
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[logging.FileHandler("logs/stocksentinel.log"), logging.StreamHandler()],
-    )
+    """Setup logging configuration; repeated calls only change the level"""
+    root = logging.getLogger()
+    root.setLevel(getattr(logging, log_level))
+
+    # Handlers go on the root logger so every module's logger reaches them, but only once
+    if not _log_handlers:
+        _log_handlers.extend(
+            [logging.FileHandler("logs/stocksentinel.log", delay=True), logging.StreamHandler()]
+        )
+        for handler in _log_handlers:
+            handler.setFormatter(_LOG_FORMATTER)
+            root.addHandler(handler)
+
     return logging.getLogger(__name__)
 
 
@@ -25,28 +106,108 @@ def ensure_directories():
 
 
 def save_json(data: Dict[str, Any], filepath: str) -> None:
-    """Save data to JSON file"""
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    """
+    Save data to JSON file, written to a temp file first so readers never see partial files
+    Unchanged content is not rewritten.
+    """
+    payload = orjson.dumps(
+        data,
+        option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+    )
+
+    # Leave the file (and its mtime) alone if the content is unchanged; the size check means
+    # the old content is only read when a match is possible
+    try:
+        if os.path.getsize(filepath) == len(payload) and Path(filepath).read_bytes() == payload:
+            return
+    except OSError:
+        pass
+
+    # Unlike mkstemp (always 0600), os.open with 0o666 honours the umask like a plain open();
+    # an existing file keeps its own mode
+    tmp_path = f"{filepath}.{os.urandom(8).hex()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            try:
+                os.fchmod(f.fileno(), os.stat(filepath).st_mode & 0o7777)
+            except FileNotFoundError:
+                pass
+            f.write(payload)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
 
 
 def load_json(filepath: str) -> Dict[str, Any]:
-    """Load data from JSON file"""
-    with open(filepath, "r", encoding="utf-8") as f:
-        return json.load(f)
+    """Load data from JSON file (large files are parsed from a memory map instead of a copy)"""
+    with open(filepath, "rb") as f:
+        if os.fstat(f.fileno()).st_size < MMAP_MIN_BYTES:
+            return orjson.loads(f.read())
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                return orjson.loads(view)
 
 
-def get_date_range(days: int = 7) -> tuple:
+def iter_json_items(filepath: str, prefix: str = "item") -> Iterator[Any]:
+    """
+    Stream records from a JSON file without loading all of it
+    Args:
+        filepath: Path to the JSON file
+        prefix: ijson prefix of the records, e.g. "articles.item" for a saved news file
+    Returns:
+        Iterator over the records (the whole file is parsed if ijson is not installed)
+    """
+    if ijson is not None:
+        with open(filepath, "rb") as f:
+            yield from ijson.items(f, prefix, use_float=True)
+        return
+
+    nodes = [load_json(filepath)]
+    for key in prefix.split(".") if prefix else []:
+        if key == "item":
+            nodes = [item for node in nodes if isinstance(node, list) for item in node]
+        else:
+            nodes = [node[key] for node in nodes if isinstance(node, dict) and key in node]
+    yield from nodes
+
+
+def get_date_range(days: int = 7, now: Optional[datetime] = None) -> tuple:
     """
     Get date range for news collection
     Args:
         days: Number of days to look back
+        now: End of the range (default: current local time)
     Returns:
-        Tuple of (start_date, end_date) as strings
+        Tuple of (start_date, end_date) as YYYY-MM-DD strings
     """
-    end_date = datetime.now()
+    end_date = (now or datetime.now()).date()
     start_date = end_date - timedelta(days=days)
-    return start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
+    # date.isoformat() is YYYY-MM-DD without strftime's format parsing
+    return start_date.isoformat(), end_date.isoformat()
+
+
+def to_utc_isoformat(value: Any) -> str:
+    """
+    Normalize a timestamp to an ISO 8601 string in UTC
+    Args:
+        value: Unix timestamp in seconds or ISO 8601 string (naive values are treated as UTC)
+    Returns:
+        String like "2024-01-01T12:00:00+00:00", or "" if the value can't be parsed
+    """
+    try:
+        if isinstance(value, (int, float)):
+            dt = datetime.fromtimestamp(value, tz=timezone.utc)
+        else:
+            dt = _parse_iso_datetime(str(value))
+    except (TypeError, ValueError, OverflowError, OSError):
+        return ""
+
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).isoformat(timespec="seconds")
 
 
 def clean_text(text: str) -> str:
@@ -60,13 +221,86 @@ def clean_text(text: str) -> str:
     if not text:
         return ""
 
-    # Remove extra whitespace
-    text = " ".join(text.split())
+    # URLs carry no sentiment and only use up tokens
+    if "http" in text:
+        text = _URL_RE.sub("", text)
 
-    # Remove special characters but keep basic punctuation
-    # text = re.sub(r'[^a-zA-Z0-9\s\.\,\!\?]', '', text)
+    # Collapse whitespace (split() also drops leading and trailing whitespace); in CPython
+    # this beats a precompiled r"\s+" substitution several times over
+    return " ".join(text.split())
 
-    return text.strip()
+
+def clean_texts(texts: List[str]) -> List[str]:
+    """
+    Clean a batch of texts, same as clean_text for each one
+    Args:
+        texts: Raw text strings
+    Returns:
+        Cleaned texts
+    """
+    # Bind the compiled pattern once instead of per text
+    strip_urls = _URL_RE.sub
+    return [
+        " ".join((strip_urls("", text) if "http" in text else text).split()) if text else ""
+        for text in texts
+    ]
+
+
+@lru_cache(maxsize=1)
+def _url_database() -> "hyperscan.Database":
+    """Compile the URL pattern into a Hyperscan database, once per process"""
+    database = hyperscan.Database()
+    database.compile(
+        expressions=[_URL_RE.pattern.encode("ascii")],
+        ids=[0],
+        elements=1,
+        # Report match starts, and treat \S like Python's Unicode-aware \S
+        flags=[hyperscan.HS_FLAG_SOM_LEFTMOST | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP],
+    )
+    return database
+
+
+def _strip_urls_hyperscan(text: str) -> str:
+    """Remove URLs from a text in a single Hyperscan pass, same result as _URL_RE.sub"""
+    try:
+        data = text.encode("utf-8")
+    except UnicodeEncodeError:
+        # Lone surrogates from scraped text aren't valid UTF-8 for Hyperscan to scan
+        return _URL_RE.sub("", text)
+    matches = []
+    with _hyperscan_lock:
+        # Hyperscan reports every end offset of a greedy match; spans are merged below
+        _url_database().scan(
+            data, match_event_handler=lambda _, start, end, *args: matches.append((start, end))
+        )
+    if not matches:
+        return text
+
+    kept = bytearray()
+    position = 0
+    for start, end in sorted(matches):
+        if start > position:
+            kept += data[position:start]
+        position = max(position, end)
+    kept += data[position:]
+    return kept.decode("utf-8")
+
+
+def clean_texts_fast(texts: List[str]) -> List[str]:
+    """
+    Clean a batch of texts, scanning for URLs with Hyperscan when it is installed
+    Args:
+        texts: Raw text strings
+    Returns:
+        Cleaned texts, identical to clean_texts
+    """
+    if hyperscan is None:
+        return clean_texts(texts)
+
+    return [
+        " ".join((_strip_urls_hyperscan(text) if "http" in text else text).split()) if text else ""
+        for text in texts
+    ]
 
 
 def calculate_sentiment_score(positive: float, negative: float, neutral: float) -> float:
@@ -82,6 +316,18 @@ def calculate_sentiment_score(positive: float, negative: float, neutral: float)
     return positive - negative
 
 
+def calculate_sentiment_scores(positive: np.ndarray, negative: np.ndarray) -> np.ndarray:
+    """
+    Calculate sentiment scores for a batch of probabilities
+    Args:
+        positive: Positive sentiment probabilities
+        negative: Negative sentiment probabilities
+    Returns:
+        Contiguous float32 array of scores between -1 (negative) and 1 (positive)
+    """
+    return np.subtract(positive, negative, dtype=np.float32)
+
+
 def aggregate_sentiments(sentiments: List[float]) -> Dict[str, Any]:
     """
     Aggregate multiple sentiment scores
@@ -93,57 +339,323 @@ def aggregate_sentiments(sentiments: List[float]) -> Dict[str, Any]:
     if not sentiments:
         return {"mean": 0.0, "median": 0.0, "std": 0.0, "min": 0.0, "max": 0.0, "count": 0}
 
-    df = pd.Series(sentiments)
+    values = np.asarray(sentiments, dtype=np.float64)
+    return {
+        "mean": float(values.mean()),
+        "median": float(np.median(values)),
+        # Sample standard deviation, as pandas computed it; a single score has no spread
+        "std": float(values.std(ddof=1)) if values.size > 1 else 0.0,
+        "min": float(values.min()),
+        "max": float(values.max()),
+        "count": int(values.size),
+    }
+
+
+def pack_scores(scores: Sequence[float]) -> np.ndarray:
+    """
+    Quantize sentiment scores to int8 for compact storage
+    Args:
+        scores: Sentiment scores between -1 and 1
+    Returns:
+        int8 array of round(score * 127); the error is at most 1/254 per score
+    """
+    scores = np.clip(np.asarray(scores, dtype=np.float32), -1.0, 1.0)
+    return np.rint(scores * SCORE_SCALE).astype(np.int8)
+
+
+def unpack_scores(packed: np.ndarray) -> np.ndarray:
+    """Convert int8 scores from pack_scores back to float32"""
+    return np.asarray(packed, dtype=np.float32) / SCORE_SCALE
+
+
+def aggregate_sentiments_int8(packed: np.ndarray) -> Dict[str, Any]:
+    """
+    Aggregate int8 scores from pack_scores, same statistics as aggregate_sentiments
+    Args:
+        packed: Quantized sentiment scores
+    Returns:
+        Dictionary with aggregated statistics on the original -1 to 1 scale
+    """
+    packed = np.asarray(packed, dtype=np.int8)
+    count = int(packed.size)
+    if not count:
+        return {"mean": 0.0, "median": 0.0, "std": 0.0, "min": 0.0, "max": 0.0, "count": 0}
+
+    # int32 accumulators can't overflow below 16 million scores of +-127
+    total = int(packed.sum(dtype=np.int64 if count >= 1 << 24 else np.int32))
+    return {
+        "mean": total / SCORE_SCALE / count,
+        "median": float(np.median(packed)) / SCORE_SCALE,
+        "std": float(packed.std(ddof=1, dtype=np.float64)) / SCORE_SCALE if count > 1 else 0.0,
+        "min": int(packed.min()) / SCORE_SCALE,
+        "max": int(packed.max()) / SCORE_SCALE,
+        "count": count,
+    }
+
+
+def _run_statistics(values: np.ndarray, starts: np.ndarray, counts: np.ndarray) -> tuple:
+    """
+    Compute statistics for contiguous runs of sorted values
+    Args:
+        values: Scores, sorted within each run
+        starts: Start offset of each run
+        counts: Length of each run (all > 0)
+    Returns:
+        Tuple of (means, medians, stds, mins, maxs) arrays, one entry per run
+    """
+    means = np.add.reduceat(values, starts) / counts
+    medians = (values[starts + (counts - 1) // 2] + values[starts + counts // 2]) / 2
+    squares = np.add.reduceat((values - np.repeat(means, counts)) ** 2, starts)
+    # Sample standard deviation like aggregate_sentiments; a single score has no spread
+    stds = np.sqrt(squares / np.maximum(counts - 1, 1))
+    return means, medians, stds, values[starts], values[starts + counts - 1]
+
+
+def aggregate_sentiments_grouped(
+    scores: np.ndarray, group_ids: np.ndarray
+) -> Dict[Any, Dict[str, Any]]:
+    """
+    Aggregate sentiment scores per group (e.g. per ticker) in one vectorized pass
+    Args:
+        scores: Sentiment scores
+        group_ids: Group of each score, same length as scores
+    Returns:
+        Dictionary mapping each group to the same statistics as aggregate_sentiments
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    group_ids = np.asarray(group_ids)
+    if scores.size == 0:
+        return {}
+
+    # Sort by group, then by score, so each group is a sorted contiguous run
+    order = np.lexsort((scores, group_ids))
+    groups = group_ids[order]
+    values = scores[order]
+
+    starts = np.r_[0, np.flatnonzero(groups[1:] != groups[:-1]) + 1]
+    counts = np.diff(np.r_[starts, values.size])
+    means, medians, stds, mins, maxs = _run_statistics(values, starts, counts)
+
     return {
-        "mean": float(df.mean()),
-        "median": float(df.median()),
-        "std": float(df.std()),
-        "min": float(df.min()),
-        "max": float(df.max()),
-        "count": len(sentiments),
+        group: {
+            "mean": mean,
+            "median": median,
+            "std": std,
+            "min": low,
+            "max": high,
+            "count": count,
+        }
+        for group, mean, median, std, low, high, count in zip(
+            groups[starts].tolist(),
+            means.tolist(),
+            medians.tolist(),
+            stds.tolist(),
+            mins.tolist(),
+            maxs.tolist(),
+            counts.tolist(),
+        )
     }
 
 
+def aggregate_sentiments_batch(batches: Sequence[Sequence[float]]) -> np.ndarray:
+    """
+    Aggregate many lists of sentiment scores into one compact structured array
+    Args:
+        batches: Lists of sentiment scores
+    Returns:
+        Array of STATS_DTYPE with one row per list (all zeros for an empty list);
+        pd.DataFrame(result) turns it into a table
+    """
+    counts = np.fromiter((len(batch) for batch in batches), dtype=np.int64, count=len(batches))
+    stats = np.zeros(len(batches), dtype=STATS_DTYPE)
+    stats["count"] = counts
+
+    filled = counts > 0
+    if not filled.any():
+        return stats
+
+    values = np.concatenate(
+        [np.asarray(batch, dtype=np.float64) for batch in batches if len(batch)]
+    )
+    rows = np.repeat(np.flatnonzero(filled), counts[filled])
+    values = values[np.lexsort((values, rows))]
+
+    run_counts = counts[filled]
+    starts = np.r_[0, np.cumsum(run_counts)[:-1]]
+    columns = _run_statistics(values, starts, run_counts)
+    for name, column in zip(("mean", "median", "std", "min", "max"), columns):
+        stats[name][filled] = column
+    return stats
+
+
+@lru_cache(maxsize=8192)
 def format_ticker(ticker: str) -> str:
     """Format ticker symbol to uppercase"""
     return ticker.upper().strip()
 
 
-def validate_ticker(ticker: str) -> bool:
+def _is_ticker_format(ticker: str) -> bool:
+    """Check that a formatted ticker has 1-5 letters"""
+    return 1 <= len(ticker) <= 5 and ticker.isalpha()
+
+
+def _fetch_listed_tickers(tickers: List[str]) -> Set[str]:
     """
-    Validate ticker symbol format and check if it exists
+    Look up several symbols with one Yahoo Finance quote request
+    Network errors and error responses propagate and are therefore not cached.
     Args:
-        ticker: Stock ticker symbol
+        tickers: Up to TICKER_BATCH_SIZE formatted ticker symbols
     Returns:
-        True if valid format and exists
+        Symbols that Yahoo Finance knows as a named security
     """
-    ticker = ticker.upper().strip()
+    # Imported on first lookup: yfinance (and pandas with it) is slow to import.
+    # YfData is a process-wide singleton: its keep-alive session (shared with every yf.Ticker)
+    # pools connections and handles Yahoo's cookie and crumb
+    from yfinance.data import YfData
+
+    data = YfData().get_raw_json(_QUOTE_URL, params={"symbols": ",".join(tickers)})
+
+    # Yahoo reports errors (bad crumb, rate limits) with status 200; an error payload must not
+    # be read as "no symbols listed", or every symbol in the batch would be cached as invalid
+    response = data.get("quoteResponse") if isinstance(data, dict) else None
+    if not isinstance(response, dict):
+        error = (data.get("finance") or {}).get("error") if isinstance(data, dict) else None
+        raise ValueError(f"Unexpected quote response: {error or data!r}")
+    if response.get("error") or response.get("result") is None:
+        raise ValueError(f"Quote request failed: {response.get('error')!r}")
+
+    quotes = response["result"]
+    return {
+        quote["symbol"].upper()
+        for quote in quotes
+        if quote.get("symbol") and (quote.get("shortName") or quote.get("longName"))
+    }
 
-    # Basic format validation
-    if not ticker or len(ticker) < 1 or len(ticker) > 5:
-        return False
 
-    if not ticker.isalpha():
-        return False
+def validate_tickers(tickers: List[str]) -> Dict[str, bool]:
+    """
+    Validate ticker symbol formats and check in batches whether they exist
+    S&P 500 symbols are accepted right away; other results are cached in memory and on disk,
+    and symbols are looked up 20 per request.
+    Args:
+        tickers: Stock ticker symbols
+    Returns:
+        Dictionary mapping each input symbol to True if valid format and exists
+    """
+    formatted = {ticker: format_ticker(ticker) for ticker in tickers}
+
+    results: Dict[str, bool] = {}
+    misses = []
+    for ticker in dict.fromkeys(formatted.values()):
+        # Basic format validation
+        if not _is_ticker_format(ticker):
+            results[ticker] = False
+            continue
+
+        # S&P 500 symbols need no lookup
+        if ticker in KNOWN_TICKERS:
+            results[ticker] = True
+            continue
+
+        with _ticker_memo_lock:
+            known = _ticker_memo.get(ticker)
+        if known is None:
+            cached = _ticker_cache.get("tickers", ticker)
+            if cached is not None:
+                known = cached["valid"]
+                with _ticker_memo_lock:
+                    _ticker_memo[ticker] = known
+        if known is None:
+            misses.append(ticker)
+        else:
+            results[ticker] = known
+
+    # Only one caller looks up a given symbol at a time; the others wait for its result
+    owned: List[str] = []
+    waiting: Dict[str, Future] = {}
+    with _inflight_lock:
+        for ticker in misses:
+            if ticker in _inflight:
+                waiting[ticker] = _inflight[ticker]
+            else:
+                _inflight[ticker] = Future()
+                owned.append(ticker)
+
+    looked_up: Dict[str, Optional[bool]] = {}
+    try:
+        remaining = iter(owned)
+        while chunk := list(islice(remaining, TICKER_BATCH_SIZE)):
+            looked_up.update(_look_up_tickers(chunk))
+    finally:
+        with _inflight_lock:
+            futures = [_inflight.pop(ticker) for ticker in owned]
+        for ticker, future in zip(owned, futures):
+            future.set_result(looked_up.get(ticker))
+
+    looked_up.update({ticker: future.result() for ticker, future in waiting.items()})
+    # If yfinance failed (None), accept based on format only
+    results.update({ticker: valid is not False for ticker, valid in looked_up.items()})
 
-    # Try to verify ticker exists using yfinance
+    return {ticker: results[symbol] for ticker, symbol in formatted.items()}
+
+
+def _look_up_tickers(tickers: List[str]) -> Dict[str, Optional[bool]]:
+    """
+    Look up one batch of symbols and cache the results
+    Args:
+        tickers: Up to TICKER_BATCH_SIZE formatted ticker symbols
+    Returns:
+        Dictionary mapping each symbol to whether it exists, or None if the lookup failed
+    """
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
+        listed = _fetch_listed_tickers(tickers)
+    except Exception as e:
+        # Failures are not cached, so the next call retries
+        logger.warning(f"Could not look up tickers {tickers}: {e}")
+        return dict.fromkeys(tickers)
 
-        # yfinance returns an almost empty dict for invalid tickers
-        if not info or len(info) < 5:
-            return False
+    looked_up = {ticker: ticker in listed for ticker in tickers}
+    for ticker, valid in looked_up.items():
+        _ticker_cache.set("tickers", ticker, {"valid": valid}, TICKER_CACHE_TTL)
+    with _ticker_memo_lock:
+        _ticker_memo.update(looked_up)
+    return looked_up
 
-        # Check for key fields that indicate a valid stock
-        if "symbol" not in info and "shortName" not in info and "longName" not in info:
-            return False
 
-        return True
+def validate_tickers_parallel(tickers: List[str], max_workers: int = 8) -> Dict[str, bool]:
+    """
+    Validate many tickers with concurrent batch lookups
+    Each worker validates one batch of TICKER_BATCH_SIZE symbols, so cache hits stay local
+    and only misses go to the network.
+    Args:
+        tickers: Stock ticker symbols
+        max_workers: Maximum number of concurrent lookups
+    Returns:
+        Dictionary mapping each input symbol to True if valid format and exists
+    """
+    chunks = [
+        tickers[start : start + TICKER_BATCH_SIZE]
+        for start in range(0, len(tickers), TICKER_BATCH_SIZE)
+    ]
+    if len(chunks) <= 1:
+        return validate_tickers(tickers)
+
+    results: Dict[str, bool] = {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+        for chunk_results in executor.map(validate_tickers, chunks):
+            results.update(chunk_results)
+    return results
 
-    except Exception:
-        # If yfinance fails, accept based on format only
-        return True
+
+def validate_ticker(ticker: str) -> bool:
+    """
+    Validate ticker symbol format and check if it exists
+    Args:
+        ticker: Stock ticker symbol
+    Returns:
+        True if valid format and exists
+    """
+    return validate_tickers([ticker])[ticker]
 
 
 def get_sentiment_label(score: float, threshold: float = 0.3) -> str:
@@ -161,3 +673,29 @@ def get_sentiment_label(score: float, threshold: float = 0.3) -> str:
         return "bearish"
     else:
         return "neutral"
+
+
+def get_sentiment_codes(scores: Sequence[float], threshold: float = 0.3) -> np.ndarray:
+    """
+    Convert a batch of sentiment scores to numeric labels
+    Args:
+        scores: Sentiment scores between -1 and 1
+        threshold: Threshold for positive/negative classification
+    Returns:
+        int8 array with -1 (bearish), 0 (neutral) or 1 (bullish) per score
+    """
+    # float64 so boundary values compare exactly like get_sentiment_label
+    scores = np.asarray(scores, dtype=np.float64)
+    return (scores > threshold).astype(np.int8) - (scores < -threshold)
+
+
+def get_sentiment_labels(scores: Sequence[float], threshold: float = 0.3) -> List[str]:
+    """
+    Convert a batch of sentiment scores to labels in one vectorized step
+    Args:
+        scores: Sentiment scores between -1 and 1
+        threshold: Threshold for positive/negative classification
+    Returns:
+        List of "bullish", "neutral", or "bearish"
+    """
+    return SENTIMENT_LABELS[get_sentiment_codes(scores, threshold) + 1].tolist()
@@ -0,0 +1,31 @@
+import threading
+
+import yfinance as yf
+from cachetools import TTLCache
+
+# Ticker objects memoize info, fast_info and news, so reuse them only briefly
+TICKER_TTL = 600
+
+_tickers: TTLCache = TTLCache(maxsize=256, ttl=TICKER_TTL)
+_tickers_lock = threading.Lock()
+
+
+def get_ticker(ticker: str) -> yf.Ticker:
+    """
+    Get a shared yfinance Ticker, so news and stock info for a symbol use one instance
+    Args:
+        ticker: Formatted stock ticker symbol
+    Returns:
+        yfinance Ticker, recreated after TICKER_TTL seconds
+    """
+    with _tickers_lock:
+        stock = _tickers.get(ticker)
+        if stock is None:
+            stock = _tickers[ticker] = yf.Ticker(ticker)
+        return stock
+
+
+def clear_tickers() -> None:
+    """Drop all pooled Ticker objects"""
+    with _tickers_lock:
+        _tickers.clear()
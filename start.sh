@@ -0,0 +1,3 @@
+#!/bin/sh
+# Start the API with Gunicorn managing multiple Uvicorn workers
+exec gunicorn api.main:app -c gunicorn_conf.py "$@"
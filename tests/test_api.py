@@ -0,0 +1,359 @@
+import asyncio
+import orjson
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import AsyncMock, Mock, patch
+from fastapi.testclient import TestClient
+
+import api.main as main
+from src import batcher as batcher_module
+from src.batcher import DynamicBatcher
+
+
+def fake_analyze(texts):
+    """Fake batched analysis: every text is mildly bullish"""
+    return [{"positive": 0.5, "negative": 0.1, "neutral": 0.4, "score": 0.4} for _ in texts]
+
+
+ARTICLES = [
+    {
+        "title": f"Apple story {i}",
+        "description": "Shares move",
+        "published_at": "2024-01-01T00:00:00Z",
+        "url": f"https://example.com/{i}",
+    }
+    for i in range(3)
+]
+
+
+class FakeAsyncRedis:
+    """In-memory stand-in for the redis.asyncio client used by the report cache"""
+
+    def __init__(self, fail=False):
+        self.store = {}
+        self.ttls = {}
+        self.fail = fail
+
+    async def get(self, key):
+        if self.fail:
+            raise ConnectionError("redis down")
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None):
+        if self.fail:
+            raise ConnectionError("redis down")
+        self.store[key] = value
+        self.ttls[key] = ex
+
+    async def aclose(self):
+        pass
+
+
+@pytest.fixture
+def batcher():
+    """Batcher running fake_analyze on threads instead of FinBERT worker processes"""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        yield DynamicBatcher(fake_analyze, executor=executor, max_wait_ms=1)
+
+
+@pytest.fixture
+def client(batcher):
+    """API client with a fake batcher and no model warm-up"""
+    with patch.object(main, "batcher", batcher), patch.object(
+        main, "warm_up_inference_pool", AsyncMock()
+    ):
+        with TestClient(main.app) as client:
+            yield client
+
+
+class TestHealth:
+    """Test the health check and inference pool warm-up"""
+
+    def test_healthy(self, client):
+        """Test that a worker with a loaded model reports healthy"""
+        with patch.object(batcher_module, "_worker_analyzer", object()):
+            response = client.get("/health")
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "healthy"
+        assert response.json()["components"]["sentiment_analyzer"] == "ok"
+
+    def test_degraded_without_model(self, client):
+        """Test that a worker without a model makes the health check fail"""
+        with patch.object(batcher_module, "_worker_analyzer", None):
+            response = client.get("/health")
+
+        assert response.status_code == 503
+        assert response.json()["status"] == "degraded"
+        assert response.json()["components"]["sentiment_analyzer"] == "unavailable"
+
+    def test_broken_pool_replaced(self, client, batcher):
+        """Test that the health check replaces a broken pool and reports the new one"""
+        broken = ThreadPoolExecutor(max_workers=1)
+        broken.submit = Mock(side_effect=BrokenProcessPool("worker died"))
+        fresh = ThreadPoolExecutor(max_workers=1)
+
+        with patch.object(batcher, "executor", broken), patch.object(
+            batcher, "executor_factory", Mock(return_value=fresh)
+        ), patch.object(batcher_module, "_worker_analyzer", object()):
+            response = client.get("/health")
+            assert batcher.executor is fresh
+
+        fresh.shutdown()
+        assert response.status_code == 200
+        assert response.json()["status"] == "healthy"
+
+    def test_broken_pool_without_factory(self, client, batcher):
+        """Test that a broken pool that can't be replaced reports degraded"""
+        broken = ThreadPoolExecutor(max_workers=1)
+        broken.submit = Mock(side_effect=BrokenProcessPool("worker died"))
+
+        with patch.object(batcher, "executor", broken):
+            response = client.get("/health")
+
+        assert response.status_code == 503
+
+    def test_startup_fails_without_model(self, batcher):
+        """Test that the API refuses to start when the workers can't load the model"""
+        with patch.object(main, "batcher", batcher), patch.object(
+            batcher_module, "_worker_analyzer", None
+        ):
+            with pytest.raises(RuntimeError):
+                with TestClient(main.app):
+                    pass
+
+
+@pytest.fixture
+def stub_pipeline():
+    """Valid ticker, canned news articles and stock info without network calls"""
+    with patch.object(main, "validate_ticker", return_value=True), patch.object(
+        main.collector, "collect_all_async", AsyncMock(return_value=ARTICLES)
+    ) as collect, patch.object(main.scorer, "get_stock_info", return_value={"ticker": "AAPL"}):
+        yield collect
+
+
+@pytest.fixture
+def fake_redis():
+    """Fake Redis report cache with fresh hit/miss/error counters"""
+    redis = FakeAsyncRedis()
+    with patch.object(main, "redis_client", redis), patch.dict(
+        main.cache_stats, {"hits": 0, "misses": 0, "errors": 0}
+    ):
+        yield redis
+
+
+class TestReportCache:
+    """Test the Redis cache for analysis reports"""
+
+    def test_miss_store_hit(self, client, stub_pipeline, fake_redis):
+        """Test that a miss stores the report with the TTL and the next request is a hit"""
+        first = client.get("/api/analyze/aapl", params={"days": 3, "max_articles": 10})
+        assert first.status_code == 200
+        assert list(fake_redis.store) == ["analysis:AAPL:3:10"]
+        assert fake_redis.ttls["analysis:AAPL:3:10"] == main.analysis_cache_ttl
+        assert orjson.loads(fake_redis.store["analysis:AAPL:3:10"])["article_count"] == 3
+        assert main.cache_stats == {"hits": 0, "misses": 1, "errors": 0}
+
+        second = client.get("/api/analyze/AAPL", params={"days": 3, "max_articles": 10})
+        assert second.status_code == 200
+        assert second.json() == first.json()
+        assert stub_pipeline.call_count == 1
+        assert main.cache_stats == {"hits": 1, "misses": 1, "errors": 0}
+
+    def test_key_per_query(self, client, stub_pipeline, fake_redis):
+        """Test that different lookback windows are cached separately"""
+        client.get("/api/analyze/AAPL")
+        client.get("/api/analyze/AAPL", params={"days": 14})
+
+        assert sorted(fake_redis.store) == ["analysis:AAPL:14:50", "analysis:AAPL:7:50"]
+        assert stub_pipeline.call_count == 2
+
+    def test_redis_error(self, client, stub_pipeline, fake_redis):
+        """Test that an unavailable Redis is counted but does not fail the request"""
+        fake_redis.fail = True
+        response = client.get("/api/analyze/AAPL")
+
+        assert response.status_code == 200
+        assert response.json()["article_count"] == 3
+        assert main.cache_stats == {"hits": 0, "misses": 0, "errors": 2}
+
+    def test_stats_in_health(self, client, fake_redis):
+        """Test that the cache counters are reported by the health check"""
+        main.cache_stats["hits"] = 4
+        with patch.object(batcher_module, "_worker_analyzer", object()):
+            cache = client.get("/health").json()["cache"]
+
+        assert cache == {"enabled": True, "hits": 4, "misses": 0, "errors": 0}
+
+
+def stream_events(client, ticker="AAPL"):
+    """Request the streaming analysis and parse its NDJSON events"""
+    response = client.get(f"/api/analyze/{ticker}/stream")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    return [orjson.loads(line) for line in response.text.splitlines()]
+
+
+class TestAnalyzeStream:
+    """Test the NDJSON streaming analysis endpoint"""
+
+    def test_event_order(self, client, stub_pipeline):
+        """Test collected, one sentiment event per article, then the report"""
+        events = stream_events(client, "aapl")
+
+        assert [e["type"] for e in events] == ["collected"] + ["sentiment"] * 3 + ["report"]
+        assert events[0]["n"] == 3
+
+        sentiments = events[1:-1]
+        assert [e["done"] for e in sentiments] == [1, 2, 3]
+        assert {e["total"] for e in sentiments} == {3}
+        assert sorted(e["article"]["title"] for e in sentiments) == [a["title"] for a in ARTICLES]
+        assert {e["article"]["sentiment_score"] for e in sentiments} == {0.4}
+
+        report = events[-1]["report"]
+        assert report["ticker"] == "AAPL"
+        assert report["article_count"] == 3
+        assert report["stock_info"] == {"ticker": "AAPL"}
+
+    def test_cached_report(self, client, stub_pipeline, fake_redis):
+        """Test that a cached report is streamed as the only event"""
+        first = stream_events(client)
+        second = stream_events(client)
+
+        assert second == [{"type": "report", "report": first[-1]["report"]}]
+        assert stub_pipeline.call_count == 1
+
+    def test_no_articles(self, client, stub_pipeline):
+        """Test that an empty news feed ends the stream with an error event"""
+        stub_pipeline.return_value = []
+        events = stream_events(client)
+
+        assert [e["type"] for e in events] == ["collected", "error"]
+        assert events[0]["n"] == 0
+        assert "AAPL" in events[1]["detail"]
+
+    def test_error_event(self, client, stub_pipeline):
+        """Test that a failure after the stream started is reported as an error event"""
+        stub_pipeline.side_effect = RuntimeError("news feed down")
+
+        assert stream_events(client) == [{"type": "error", "detail": "news feed down"}]
+
+    def test_disconnect_cancels_pending(self, stub_pipeline):
+        """Test that closing the stream early cancels articles still waiting for the batcher"""
+        cancelled = []
+
+        async def analyze_article(article):
+            if article is ARTICLES[0]:
+                return {**article, "sentiment": {"score": 0.4}, "sentiment_label": "positive"}
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.append(article["title"])
+                raise
+
+        async def read_first_sentiment():
+            fake_batcher = Mock(analyze_article_async=analyze_article)
+            with patch.object(main, "batcher", fake_batcher):
+                response = await main.analyze_ticker_stream("AAPL", days=7, max_articles=50)
+                events = response.body_iterator
+                first = [orjson.loads(await events.__anext__()) for _ in range(2)]
+                await events.aclose()
+                # Let the cancellations land before asyncio.run cancels leftovers itself
+                await asyncio.sleep(0)
+            return first, list(cancelled)
+
+        first, cancelled_on_close = asyncio.run(read_first_sentiment())
+
+        assert [e["type"] for e in first] == ["collected", "sentiment"]
+        assert sorted(cancelled_on_close) == [a["title"] for a in ARTICLES[1:]]
+
+    def test_invalid_ticker(self, client, stub_pipeline):
+        """Test that invalid tickers are rejected before streaming starts"""
+        with patch.object(main, "validate_ticker", return_value=False):
+            response = client.get("/api/analyze/NOPE/stream")
+
+        assert response.status_code == 400
+        stub_pipeline.assert_not_called()
+
+
+class TestTaskQueue:
+    """Test queueing analyses on Celery and polling their status"""
+
+    @pytest.fixture
+    def analyze_task(self):
+        """Celery task whose delay() returns a job without contacting a broker"""
+        task = Mock()
+        task.delay.return_value.id = "job-1"
+        with patch.object(main, "analyze_task", task), patch.object(
+            main, "validate_ticker", return_value=True
+        ):
+            yield task
+
+    def job_status(self, client, state, result=None):
+        """Poll a job whose AsyncResult is in the given Celery state"""
+        async_result = Mock(state=state, result=result)
+        async_result.successful.return_value = state == "SUCCESS"
+        async_result.failed.return_value = state == "FAILURE"
+        with patch.object(main, "celery_app") as celery_app:
+            celery_app.AsyncResult.return_value = async_result
+            response = client.get("/api/analyze/status/job-1")
+            celery_app.AsyncResult.assert_called_once_with("job-1")
+        return response
+
+    def test_submit(self, client, analyze_task):
+        """Test that a queued analysis returns its job id and status URL"""
+        response = client.post("/api/analyze/aapl", params={"days": 3, "max_articles": 10})
+
+        assert response.status_code == 202
+        assert response.json() == {"job_id": "job-1", "status_url": "/api/analyze/status/job-1"}
+        analyze_task.delay.assert_called_once_with("AAPL", 3, 10)
+
+    def test_submit_broker_down(self, client, analyze_task):
+        """Test that an unreachable broker is reported as 503"""
+        analyze_task.delay.side_effect = ConnectionError("broker down")
+
+        assert client.post("/api/analyze/AAPL").status_code == 503
+
+    def test_submit_invalid_ticker(self, client, analyze_task):
+        """Test that invalid tickers are rejected before queueing"""
+        with patch.object(main, "validate_ticker", return_value=False):
+            assert client.post("/api/analyze/NOPE").status_code == 400
+        analyze_task.delay.assert_not_called()
+
+    def test_status_pending(self, client, analyze_task):
+        """Test that an unfinished job reports only its state"""
+        response = self.job_status(client, "PENDING")
+
+        assert response.status_code == 200
+        assert response.json() == {"job_id": "job-1", "state": "PENDING"}
+
+    def test_status_success(self, client, analyze_task):
+        """Test that a finished job includes its report"""
+        response = self.job_status(client, "SUCCESS", {"ticker": "AAPL", "article_count": 3})
+
+        assert response.json() == {
+            "job_id": "job-1",
+            "state": "SUCCESS",
+            "report": {"ticker": "AAPL", "article_count": 3},
+        }
+
+    def test_status_failure(self, client, analyze_task):
+        """Test that a failed job includes the error message"""
+        response = self.job_status(client, "FAILURE", ValueError("No news articles found"))
+
+        assert response.json() == {
+            "job_id": "job-1",
+            "state": "FAILURE",
+            "error": "No news articles found",
+        }
+
+    def test_unavailable_without_celery(self, client):
+        """Test that both endpoints return 503 when Celery is not installed"""
+        with patch.object(main, "analyze_task", None):
+            assert client.post("/api/analyze/AAPL").status_code == 503
+            assert client.get("/api/analyze/status/job-1").status_code == 503
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
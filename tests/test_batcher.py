@@ -0,0 +1,157 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import pytest
+from unittest.mock import patch
+from src import batcher as batcher_module
+from src.batcher import DynamicBatcher, init_inference_worker, ping_inference_worker
+
+
+class FakeAnalyzer:
+    """Fake analyzer that records each batch it receives"""
+
+    def __init__(self):
+        self.batches = []
+
+    def analyze_texts(self, texts):
+        self.batches.append(list(texts))
+        return [{"score": float(len(text))} for text in texts]
+
+
+class TestDynamicBatcher:
+    """Test DynamicBatcher class"""
+
+    def test_concurrent_requests_share_batch(self):
+        """Test that concurrent texts are coalesced into one forward pass"""
+        analyzer = FakeAnalyzer()
+
+        async def run():
+            batcher = DynamicBatcher(analyzer.analyze_texts, max_batch_size=8, max_wait_ms=50)
+            await batcher.start()
+            try:
+                return await asyncio.gather(
+                    *(batcher.analyze_text_async(t) for t in ["a", "bb", "ccc"])
+                )
+            finally:
+                await batcher.stop()
+
+        results = asyncio.run(run())
+
+        assert [r["score"] for r in results] == [1.0, 2.0, 3.0]
+        assert analyzer.batches == [["a", "bb", "ccc"]]
+
+    def test_batch_size_limit(self):
+        """Test that batches never exceed max_batch_size"""
+        analyzer = FakeAnalyzer()
+
+        async def run():
+            batcher = DynamicBatcher(analyzer.analyze_texts, max_batch_size=2, max_wait_ms=50)
+            await batcher.start()
+            try:
+                articles = [{"title": t, "description": ""} for t in ["a", "b", "c", "d", "e"]]
+                return await asyncio.gather(*(batcher.analyze_article_async(a) for a in articles))
+            finally:
+                await batcher.stop()
+
+        results = asyncio.run(run())
+
+        assert len(results) == 5
+        assert results[0]["sentiment"]["score"] == 1.0
+        assert results[0]["sentiment_label"] == "bullish"
+        assert all(len(batch) <= 2 for batch in analyzer.batches)
+
+    def test_concurrent_batches(self):
+        """Test that up to max_concurrent_batches forward passes run at the same time"""
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def analyze(texts):
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.pop()
+            return [{"score": 1.0} for _ in texts]
+
+        async def run():
+            batcher = DynamicBatcher(
+                analyze,
+                executor=executor,
+                max_batch_size=1,
+                max_wait_ms=1,
+                max_concurrent_batches=2,
+            )
+            await batcher.start()
+            try:
+                return await asyncio.gather(*(batcher.analyze_text_async(t) for t in "abcd"))
+            finally:
+                await batcher.stop()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = asyncio.run(run())
+
+        assert len(results) == 4
+        assert max(peak) == 2
+
+    def test_broken_executor_replaced(self):
+        """Test that a broken executor fails its batch and is replaced for later batches"""
+        executors = []
+
+        def make_executor():
+            executor = ThreadPoolExecutor(max_workers=1)
+            executors.append(executor)
+            return executor
+
+        def analyze(texts):
+            if len(executors) == 1:
+                raise BrokenProcessPool("worker died")
+            return [{"score": 1.0} for _ in texts]
+
+        async def run():
+            batcher = DynamicBatcher(analyze, executor_factory=make_executor, max_wait_ms=1)
+            await batcher.start()
+            try:
+                with pytest.raises(BrokenProcessPool):
+                    await batcher.analyze_text_async("first")
+                return await batcher.analyze_text_async("second")
+            finally:
+                await batcher.stop()
+                batcher.executor.shutdown()
+
+        assert asyncio.run(run()) == {"score": 1.0}
+        assert len(executors) == 2
+
+    def test_not_started(self):
+        """Test that submitting before start fails"""
+        batcher = DynamicBatcher(FakeAnalyzer().analyze_texts)
+        with pytest.raises(RuntimeError):
+            asyncio.run(batcher.analyze_text_async("text"))
+
+
+class TestInferenceWorker:
+    """Test inference worker setup"""
+
+    @patch("src.batcher.SentimentAnalyzer")
+    def test_init_warms_up_model(self, mock_analyzer):
+        """Test that the worker initializer loads and warms up the model"""
+        with patch.object(batcher_module, "_worker_analyzer", None):
+            init_inference_worker("some/model")
+
+            mock_analyzer.assert_called_once_with("some/model")
+            mock_analyzer.return_value.warmup.assert_called_once()
+            assert ping_inference_worker() == os.getpid()
+
+    def test_ping_uninitialized(self):
+        """Test that pinging a worker without a model fails"""
+        with patch.object(batcher_module, "_worker_analyzer", None):
+            with pytest.raises(RuntimeError):
+                ping_inference_worker()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,48 @@
+import pytest
+from unittest.mock import patch
+from src.cache import FileCache
+
+
+class TestFileCache:
+    """Test FileCache class"""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Create a FileCache in a temporary directory"""
+        return FileCache(str(tmp_path))
+
+    def test_set_and_get(self, cache):
+        """Test that stored data is returned per namespace and key"""
+        cache.set("newsapi", "AAPL:2024-01-01:2024-01-08", [{"title": "Story"}], ttl=60)
+
+        assert cache.get("newsapi", "AAPL:2024-01-01:2024-01-08") == [{"title": "Story"}]
+        assert cache.get("finnhub", "AAPL:2024-01-01:2024-01-08") is None
+        assert cache.get("newsapi", "MSFT:2024-01-01:2024-01-08") is None
+
+    def test_expired(self, cache):
+        """Test that entries expire after their TTL"""
+        with patch("src.cache.time.time", return_value=1000.0):
+            cache.set("newsapi", "key", {"a": 1}, ttl=60)
+
+        with patch("src.cache.time.time", return_value=1059.0):
+            assert cache.get("newsapi", "key") == {"a": 1}
+        with patch("src.cache.time.time", return_value=1061.0):
+            assert cache.get("newsapi", "key") is None
+
+    def test_unreadable_entry(self, cache):
+        """Test that a corrupt entry is treated as a miss"""
+        cache.set("newsapi", "key", {"a": 1}, ttl=60)
+        cache._path("newsapi", "key").write_text("{not json")
+
+        assert cache.get("newsapi", "key") is None
+
+    def test_unserializable_data(self, cache):
+        """Test that failed writes leave no entry or temp files behind"""
+        cache.set("newsapi", "key", {"a": object()}, ttl=60)
+
+        assert cache.get("newsapi", "key") is None
+        assert list(cache._path("newsapi", "key").parent.iterdir()) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
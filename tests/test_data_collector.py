@@ -1,15 +1,55 @@
+import asyncio
+import orjson
 import pytest
 from unittest.mock import Mock, patch
+import aiohttp
+from src import data_collector
 from src.data_collector import NewsCollector
 
 
+class FakeResponse:
+    """aiohttp response stand-in with a status and a JSON body"""
+
+    def __init__(self, status, body=b"[]"):
+        self.status = status
+        self.body = body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(None, (), status=self.status)
+
+    async def read(self):
+        return self.body
+
+
+class FakeSession:
+    """aiohttp session stand-in that plays back a list of responses or errors"""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def get(self, url, params=None):
+        self.calls += 1
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
 class TestNewsCollector:
     """Test NewsCollector class"""
 
     @pytest.fixture
-    def collector(self):
-        """Create NewsCollector instance"""
-        return NewsCollector()
+    def collector(self, tmp_path):
+        """Create NewsCollector instance with an empty cache"""
+        return NewsCollector(cache_dir=str(tmp_path))
 
     def test_initialization(self, collector):
         """Test collector initialization"""
@@ -17,23 +57,26 @@ class TestNewsCollector:
         assert hasattr(collector, "news_api_key")
         assert hasattr(collector, "finnhub_key")
 
-    @patch("src.data_collector.requests.get")
-    def test_collect_news_api_success(self, mock_get, collector):
+    def test_collect_news_api_success(self, collector):
         """Test successful NewsAPI collection"""
+        mock_get = Mock()
+        collector.session.get = mock_get
         # Mock response
         mock_response = Mock()
-        mock_response.json.return_value = {
-            "articles": [
-                {
-                    "title": "Test Article",
-                    "description": "Test Description",
-                    "content": "Test Content",
-                    "url": "https://example.com",
-                    "publishedAt": "2024-01-01T12:00:00Z",
-                    "source": {"name": "Test Source"},
-                }
-            ]
-        }
+        mock_response.content = orjson.dumps(
+            {
+                "articles": [
+                    {
+                        "title": "Test Article",
+                        "description": "Test Description",
+                        "content": "Test Content",
+                        "url": "https://example.com",
+                        "publishedAt": "2024-01-01T12:00:00Z",
+                        "source": {"name": "Test Source"},
+                    }
+                ]
+            }
+        )
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
 
@@ -47,25 +90,47 @@ class TestNewsCollector:
         assert articles[0]["title"] == "Test Article"
         assert articles[0]["source"] == "newsapi"
 
+        # A repeat query is served from the cache
+        assert collector.collect_news_api("AAPL", days=7) == articles
+        mock_get.assert_called_once()
+
+    def test_collect_finnhub_invalid_json(self, collector):
+        """Test that a malformed response body is handled like a failed request"""
+        mock_response = Mock()
+        mock_response.content = b"<html>Service Unavailable</html>"
+        collector.session.get = Mock(return_value=mock_response)
+        collector.finnhub_key = "test_key"
+
+        assert collector.collect_finnhub("AAPL", days=7) == []
+
+    def test_session_retries(self, collector):
+        """Test that the shared session retries transient HTTP errors"""
+        adapter = collector.session.get_adapter("https://finnhub.io")
+        assert adapter.max_retries.total == 3
+        assert 429 in adapter.max_retries.status_forcelist
+
     def test_collect_news_api_no_key(self, collector):
         """Test NewsAPI without API key"""
         collector.news_api_key = None
         articles = collector.collect_news_api("AAPL")
         assert articles == []
 
-    @patch("src.data_collector.requests.get")
-    def test_collect_finnhub_success(self, mock_get, collector):
+    def test_collect_finnhub_success(self, collector):
         """Test successful Finnhub collection"""
+        mock_get = Mock()
+        collector.session.get = mock_get
         mock_response = Mock()
-        mock_response.json.return_value = [
-            {
-                "headline": "Test Headline",
-                "summary": "Test Summary",
-                "url": "https://example.com",
-                "datetime": 1704110400,
-                "source": "Test Source",
-            }
-        ]
+        mock_response.content = orjson.dumps(
+            [
+                {
+                    "headline": "Test Headline",
+                    "summary": "Test Summary",
+                    "url": "https://example.com",
+                    "datetime": 1704110400,
+                    "source": "Test Source",
+                }
+            ]
+        )
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
 
@@ -76,7 +141,7 @@ class TestNewsCollector:
         assert len(articles) == 1
         assert articles[0]["source"] == "finnhub"
 
-    @patch("src.data_collector.yf.Ticker")
+    @patch("src.data_collector.get_ticker")
     def test_collect_yfinance_news(self, mock_ticker, collector):
         """Test Yahoo Finance news collection"""
         mock_stock = Mock()
@@ -103,6 +168,153 @@ class TestNewsCollector:
             # Verify the ticker was formatted to uppercase
             mock.assert_called_once()
 
+    def test_collect_all(self, collector):
+        """Test that collect_all merges all sources, preferring earlier sources on duplicates"""
+        newsapi = [
+            {"title": "Shared Story", "source": "newsapi", "published_at": "2024-01-02T12:00:00"},
+            {"title": "NewsAPI Story", "source": "newsapi", "published_at": "2024-01-01T12:00:00"},
+        ]
+        finnhub = [{"title": "shared story", "source": "finnhub", "published_at": "2024-01-03"}]
+        yahoo = [{"title": "Yahoo Story", "source": "yahoo", "published_at": "2024-01-04T12:00:00"}]
+
+        with patch.object(collector, "collect_news_api", return_value=newsapi), patch.object(
+            collector, "collect_finnhub", return_value=finnhub
+        ), patch.object(collector, "collect_yfinance_news", return_value=yahoo):
+            articles = collector.collect_all("aapl", days=7, max_articles=10)
+
+        assert [a["title"] for a in articles] == ["Yahoo Story", "Shared Story", "NewsAPI Story"]
+        assert articles[1]["source"] == "newsapi"
+
+    def test_merge_near_duplicate_titles(self, collector):
+        """Test that titles differing only in case, punctuation or spacing are merged"""
+        articles = [
+            {"title": "Apple Inc. reports record revenue!", "published_at": "2024-01-02"},
+            {"title": "apple inc reports  record revenue", "published_at": "2024-01-03"},
+            {"title": "Apple shares fall", "published_at": "2024-01-01"},
+            {"title": "", "published_at": "2024-01-04"},
+            {"title": None, "published_at": "2024-01-05"},
+        ]
+
+        merged = collector._merge_articles(articles, max_articles=10)
+
+        assert [a["title"] for a in merged] == [
+            "Apple Inc. reports record revenue!",
+            "Apple shares fall",
+        ]
+
+    def test_merge_unicode_titles(self, collector):
+        """Test that non-Latin and accented titles are kept and compared by their letters"""
+        articles = [
+            {"title": "日経平均が上昇", "published_at": "2024-01-05"},
+            {"title": "日経平均が上昇。", "published_at": "2024-01-04"},
+            {"title": "Nestlé raises outlook", "published_at": "2024-01-03"},
+            {"title": "Nestl raises outlook", "published_at": "2024-01-02"},
+            {"title": "???", "url": "https://example.com/a", "published_at": "2024-01-01"},
+        ]
+
+        merged = collector._merge_articles(articles, max_articles=10)
+
+        assert [a["title"] for a in merged] == [
+            "日経平均が上昇",
+            "Nestlé raises outlook",
+            "Nestl raises outlook",
+            "???",
+        ]
+
+    def test_collect_all_async(self, collector):
+        """Test concurrent collection merges and deduplicates all sources"""
+        collector.news_api_key = "test_key"
+        collector.finnhub_key = "test_key"
+
+        async def fake_fetch(session, semaphore, url, params):
+            if "newsapi" in url:
+                return {
+                    "articles": [
+                        {"title": "Shared Story", "publishedAt": "2024-01-02T12:00:00Z"},
+                        {"title": "NewsAPI Story", "publishedAt": "2024-01-01T12:00:00Z"},
+                    ]
+                }
+            return [{"headline": "shared story", "datetime": 1704110400}]
+
+        with patch.object(collector, "_fetch_json_async", side_effect=fake_fetch), patch.object(
+            collector, "collect_yfinance_news", return_value=[]
+        ):
+            articles = asyncio.run(collector.collect_all_async("aapl", days=7, max_articles=10))
+
+        titles = [a["title"] for a in articles]
+        assert titles == ["Shared Story", "NewsAPI Story"]
+
+    def test_collect_all_async_cached(self, collector):
+        """Test that a repeated async collection is served from the file cache"""
+        collector.finnhub_key = "test_key"
+        fetch = Mock(side_effect=lambda *args: [{"headline": "Story", "datetime": 1704110400}])
+
+        async def fake_fetch(session, semaphore, url, params):
+            return fetch(url)
+
+        async def collect_twice():
+            try:
+                return [
+                    await collector.collect_all_async("AAPL", days=7, max_articles=10)
+                    for _ in range(2)
+                ]
+            finally:
+                await collector.aclose()
+
+        with patch.object(collector, "_fetch_json_async", side_effect=fake_fetch), patch.object(
+            collector, "collect_yfinance_news", return_value=[]
+        ):
+            first, second = asyncio.run(collect_twice())
+
+        assert first == second
+        assert fetch.call_count == 1
+
+    def test_async_session_reused(self, collector):
+        """Test that async collections share one aiohttp session until aclose"""
+
+        async def sessions():
+            first = collector._get_async_session()
+            second = collector._get_async_session()
+            await collector.aclose()
+            return first, second
+
+        first, second = asyncio.run(sessions())
+
+        assert first is second
+        assert first.closed
+        assert collector._async_session is None
+
+    @pytest.mark.parametrize(
+        "responses, calls",
+        [
+            ([FakeResponse(503), FakeResponse(429), FakeResponse(200, b'{"ok": 1}')], 3),
+            ([aiohttp.ServerDisconnectedError(), FakeResponse(200, b'{"ok": 1}')], 2),
+        ],
+    )
+    def test_fetch_json_async_retries(self, collector, responses, calls):
+        """Test that transient HTTP errors and dropped connections are retried"""
+        session = FakeSession(responses)
+
+        with patch.object(data_collector, "RETRY_BACKOFF", 0):
+            data = asyncio.run(
+                collector._fetch_json_async(session, asyncio.Semaphore(1), "https://x", {})
+            )
+
+        assert data == {"ok": 1}
+        assert session.calls == calls
+
+    def test_fetch_json_async_gives_up(self, collector):
+        """Test that retries are bounded and the last error is raised"""
+        session = FakeSession([FakeResponse(503)] * (data_collector.MAX_RETRIES + 1))
+
+        with patch.object(data_collector, "RETRY_BACKOFF", 0):
+            with pytest.raises(aiohttp.ClientResponseError):
+                asyncio.run(
+                    collector._fetch_json_async(session, asyncio.Semaphore(1), "https://x", {})
+                )
+
+        assert session.calls == data_collector.MAX_RETRIES + 1
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
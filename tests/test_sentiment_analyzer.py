@@ -0,0 +1,352 @@
+import json
+from contextlib import contextmanager
+import numpy as np
+import pytest
+import redis
+import torch
+from unittest.mock import Mock, patch
+from src.onnx_export import ONNX_INT8_NAME, model_artifact_dir
+from src.sentiment_analyzer import MAX_CHARS_PER_TOKEN, SentimentAnalyzer
+
+
+def fake_forward(texts):
+    """Fake forward pass: positive probability encodes the text length"""
+    lengths = np.array([len(text) for text in texts], dtype=np.float32)
+    return np.stack([lengths, np.zeros_like(lengths), np.zeros_like(lengths)], axis=1)
+
+
+class FakeRedis:
+    """In-memory stand-in for the sync Redis client used by the sentiment cache"""
+
+    def __init__(self, fail=False):
+        self.store = {}
+        self.ttls = {}
+        self.mget_calls = []
+        self.fail = fail
+
+    def mget(self, keys):
+        if self.fail:
+            raise redis.ConnectionError("redis down")
+        self.mget_calls.append(list(keys))
+        return [self.store.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """Buffers set() calls until execute(), like a Redis pipeline"""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def set(self, key, value, ex=None):
+        self.commands.append((key, value, ex))
+
+    def execute(self):
+        if self.client.fail:
+            raise redis.ConnectionError("redis down")
+        for key, value, ex in self.commands:
+            self.client.store[key] = value
+            self.client.ttls[key] = ex
+
+
+@contextmanager
+def patch_model(analyzer):
+    """Replace tokenizer and model: inputs stay texts, _run behaves like fake_forward"""
+    with patch.object(analyzer, "_tokenize", side_effect=lambda texts: texts):
+        with patch.object(analyzer, "_run", side_effect=fake_forward) as mock_run:
+            yield mock_run
+
+
+class TestModelArtifacts:
+    """Test that saved quantized and ONNX models are kept apart per model"""
+
+    def test_model_artifact_dir(self):
+        """Test that each model name maps to its own subdirectory"""
+        assert model_artifact_dir("models/onnx", "ProsusAI/finbert") == model_artifact_dir(
+            "models/onnx", "ProsusAI/finbert"
+        )
+        assert str(model_artifact_dir("models/onnx", "ProsusAI/finbert")).endswith(
+            "ProsusAI--finbert"
+        )
+        assert model_artifact_dir("models/onnx", "other/model") != model_artifact_dir(
+            "models/onnx", "ProsusAI/finbert"
+        )
+
+    def test_other_model_skips_finbert_artifacts(self, tmp_path):
+        """Test that a different model doesn't load FinBERT's exported ONNX model"""
+        finbert_onnx = model_artifact_dir(str(tmp_path / "onnx"), "ProsusAI/finbert")
+        finbert_onnx.mkdir(parents=True)
+        (finbert_onnx / ONNX_INT8_NAME).write_bytes(b"onnx")
+
+        with patch.object(
+            SentimentAnalyzer, "_create_onnx_session"
+        ) as create_session, patch.object(
+            SentimentAnalyzer, "_load_quantized_model", return_value=(Mock(), Mock())
+        ) as load_quantized, patch(
+            "src.sentiment_analyzer.torch.cuda.is_available", return_value=False
+        ):
+            SentimentAnalyzer(
+                "other/model",
+                quantize=True,
+                quantized_dir=str(tmp_path / "int8"),
+                onnx_dir=str(tmp_path / "onnx"),
+                export_onnx=False,
+            )
+
+        create_session.assert_not_called()
+        load_quantized.assert_called_once_with(
+            model_artifact_dir(str(tmp_path / "int8"), "other/model")
+        )
+
+
+class TestCudaOptimization:
+    """Test GPU model preparation"""
+
+    @patch("src.sentiment_analyzer.torch.cuda.is_bf16_supported", return_value=True)
+    @patch("src.sentiment_analyzer.torch.compile")
+    def test_compiled_for_dynamic_shapes(self, mock_compile, _):
+        """Test that the model is compiled once for varying batch and sequence shapes"""
+        analyzer = SentimentAnalyzer.__new__(SentimentAnalyzer)
+        model = Mock()
+
+        with patch.dict("os.environ", {"TORCH_COMPILE": "1"}):
+            assert analyzer._optimize_for_cuda(model) is mock_compile.return_value
+
+        model.to.assert_called_once_with(torch.bfloat16)
+        mock_compile.assert_called_once_with(model.to.return_value, dynamic=True)
+
+
+class TestPredictProbs:
+    """Test length-bucketed FinBERT batching"""
+
+    def test_buckets_sorted_and_scattered_back(self):
+        """Test that texts are bucketed by length and results keep input order"""
+        analyzer = SentimentAnalyzer.__new__(SentimentAnalyzer)
+        texts = ["aaaa", "a", "aaaaa", "aa", "aaa"]
+
+        with patch_model(analyzer) as mock_forward:
+            probs = analyzer._predict_probs(texts, batch_size=2)
+
+        batches = [call.args[0] for call in mock_forward.call_args_list]
+        assert batches == [["a", "aa"], ["aaa", "aaaa"], ["aaaaa"]]
+        assert probs[:, 0].tolist() == [4.0, 1.0, 5.0, 2.0, 3.0]
+
+    def test_single_batch_skips_pipeline(self):
+        """Test that one batch runs inline without the tokenizer thread"""
+        analyzer = SentimentAnalyzer.__new__(SentimentAnalyzer)
+
+        with patch_model(analyzer), patch.object(analyzer, "_forward_pipelined") as pipelined:
+            probs = analyzer._predict_probs(["bb", "a"], batch_size=2)
+
+        pipelined.assert_not_called()
+        assert probs[:, 0].tolist() == [2.0, 1.0]
+
+    def test_empty(self):
+        """Test that no texts means no forward pass"""
+        analyzer = SentimentAnalyzer.__new__(SentimentAnalyzer)
+        with patch.object(analyzer, "_run") as mock_forward:
+            assert analyzer._predict_probs([], batch_size=2).shape == (0, 3)
+        mock_forward.assert_not_called()
+
+
+class TestAnalyzeTexts:
+    """Test batched text analysis"""
+
+    @pytest.fixture
+    def analyzer(self):
+        """Analyzer without a model or cache; tests patch _tokenize and _run"""
+        analyzer = SentimentAnalyzer.__new__(SentimentAnalyzer)
+        analyzer.model_name = "test"
+        analyzer.max_length = 256
+        analyzer.batch_size = 3
+        analyzer.prefilter = False
+        analyzer.cache = None
+        return analyzer
+
+    def test_batch_size(self, analyzer):
+        """Test default and per-call batch sizes, and neutral results for empty texts"""
+        texts = ["good", "", "bad", "fine", "great", "poor", "ok"]
+
+        with patch_model(analyzer) as mock_forward:
+            results = analyzer.analyze_texts(texts)
+            assert mock_forward.call_count == 2
+
+            mock_forward.reset_mock()
+            analyzer.analyze_texts(texts, batch_size=6)
+            assert mock_forward.call_count == 1
+
+        assert len(results) == len(texts)
+        assert results[1] == {"positive": 0.0, "negative": 0.0, "neutral": 1.0, "score": 0.0}
+        assert results[0]["positive"] == 4.0
+
+    def test_prefilter(self, analyzer):
+        """Test that the lexicon prefilter skips texts without sentiment terms"""
+        analyzer.prefilter = True
+        texts = ["Market update for Tuesday", "Apple shares surge on record profit"]
+
+        with patch_model(analyzer) as mock_forward:
+            results = analyzer.analyze_texts(texts)
+
+        assert mock_forward.call_args.args[0] == ["Apple shares surge on record profit"]
+        assert results[0]["score"] == 0.0
+        assert results[1]["positive"] == len(texts[1])
+
+    def test_long_text_truncated(self, analyzer):
+        """Test that long texts are cut before tokenizing"""
+        with patch_model(analyzer):
+            result = analyzer.analyze_texts(["word " * 1000])[0]
+
+        assert result["positive"] == 256 * MAX_CHARS_PER_TOKEN
+
+    def test_cut_beyond_token_limit(self, analyzer):
+        """Test that a text of max_length ordinary words reaches the tokenizer uncut"""
+        text = " ".join(["revenue"] * analyzer.max_length)
+        with patch_model(analyzer):
+            result = analyzer.analyze_texts([text])[0]
+
+        assert result["positive"] == len(text)
+
+
+class TestSentimentCache:
+    """Test the per-article Redis sentiment cache"""
+
+    @pytest.fixture
+    def analyzer(self):
+        """Analyzer without a model, backed by an in-memory fake Redis"""
+        analyzer = SentimentAnalyzer.__new__(SentimentAnalyzer)
+        analyzer.model_name = "test"
+        analyzer.max_length = 256
+        analyzer.batch_size = 3
+        analyzer.prefilter = False
+        analyzer.cache = FakeRedis()
+        analyzer.cache_ttl = 600
+        return analyzer
+
+    def test_get_cached_sentiments(self, analyzer):
+        """Test that one mget returns a cached value for hits and None for misses"""
+        cached = {"positive": 0.9, "negative": 0.0, "neutral": 0.1, "score": 0.9}
+        analyzer.cache.store[analyzer._cache_key("Stocks fall")] = json.dumps(cached)
+
+        assert analyzer._get_cached_sentiments(["Apple shares surge", "Stocks fall"]) == [
+            None,
+            cached,
+        ]
+        assert analyzer.cache.mget_calls == [
+            [analyzer._cache_key("Apple shares surge"), analyzer._cache_key("Stocks fall")]
+        ]
+
+    def test_set_cached_sentiments(self, analyzer):
+        """Test that writes are keyed per text and expire after cache_ttl"""
+        sentiment = {"positive": 0.2, "negative": 0.7, "neutral": 0.1, "score": -0.5}
+        analyzer._set_cached_sentiments({"Stocks fall": sentiment})
+
+        key = analyzer._cache_key("Stocks fall")
+        assert json.loads(analyzer.cache.store[key]) == sentiment
+        assert analyzer.cache.ttls[key] == 600
+
+    def test_cache_key_includes_model(self, analyzer):
+        """Test that a different model does not reuse cached sentiments"""
+        key = analyzer._cache_key("Stocks fall")
+        analyzer.model_name = "other"
+        assert analyzer._cache_key("Stocks fall") != key
+
+    def test_only_misses_predicted(self, analyzer):
+        """Test that cached texts skip the model and results keep input order"""
+        texts = ["Apple shares surge", "Stocks fall", "Markets flat"]
+        cached = {"positive": 0.0, "negative": 1.0, "neutral": 0.0, "score": -1.0}
+        analyzer.cache.store[analyzer._cache_key("Stocks fall")] = json.dumps(cached)
+
+        with patch_model(analyzer) as mock_forward:
+            results = analyzer.analyze_texts(texts)
+
+        assert mock_forward.call_count == 1
+        assert sorted(mock_forward.call_args.args[0]) == ["Apple shares surge", "Markets flat"]
+        assert [r["positive"] for r in results] == [len(texts[0]), 0.0, len(texts[2])]
+        assert results[1] == cached
+
+        # Misses were written back, so a second call never reaches the model
+        assert analyzer.cache.ttls == {
+            analyzer._cache_key("Apple shares surge"): 600,
+            analyzer._cache_key("Markets flat"): 600,
+        }
+        with patch_model(analyzer) as mock_forward:
+            assert analyzer.analyze_texts(texts) == results
+        mock_forward.assert_not_called()
+
+    def test_redis_error_is_a_miss(self, analyzer):
+        """Test that an unavailable Redis falls back to the model instead of failing"""
+        analyzer.cache = FakeRedis(fail=True)
+
+        assert analyzer._get_cached_sentiments(["Stocks fall"]) == [None]
+        with patch_model(analyzer) as mock_forward:
+            results = analyzer.analyze_texts(["Stocks fall"])
+
+        mock_forward.assert_called_once()
+        assert results[0]["positive"] == len("Stocks fall")
+
+
+class TestArticleText:
+    """Test article text extraction"""
+
+    def test_get_article_text(self):
+        """Test that missing or null fields don't leak into the text"""
+        assert SentimentAnalyzer.get_article_text({"title": "T", "description": "D"}) == "T D"
+        assert SentimentAnalyzer.get_article_text({"title": "T", "description": None}) == "T"
+        assert SentimentAnalyzer.get_article_text({"description": "D"}) == "D"
+        assert SentimentAnalyzer.get_article_text({}) == ""
+
+
+class TestLabels:
+    """Test sentiment labels"""
+
+    def test_batch_labels_match_scalar(self):
+        """Test that vectorized labels match _get_label, including the thresholds"""
+        scores = [-1.0, -0.31, -0.3, 0.0, 0.3, 0.31, 1.0]
+
+        labels = SentimentAnalyzer._get_labels(scores)
+
+        assert labels == [SentimentAnalyzer._get_label(score) for score in scores]
+        assert labels[:2] == ["bearish", "bearish"]
+        assert labels[-2:] == ["bullish", "bullish"]
+        assert SentimentAnalyzer._get_labels([]) == []
+
+
+class TestAggregatedSentiment:
+    """Test sentiment aggregation"""
+
+    def test_aggregated_sentiment(self):
+        """Test statistics and label ratios"""
+        articles = [
+            {"sentiment": {"score": 0.8}, "sentiment_label": "bullish"},
+            {"sentiment": {"score": -0.5}, "sentiment_label": "bearish"},
+            {"sentiment": {"score": 0.1}, "sentiment_label": "neutral"},
+            {"sentiment": {"score": 0.6}, "sentiment_label": "bullish"},
+            {},
+        ]
+
+        result = SentimentAnalyzer.get_aggregated_sentiment(articles)
+
+        assert result["mean_score"] == pytest.approx(0.2)
+        assert result["median_score"] == pytest.approx(0.1)
+        assert result["std_score"] == pytest.approx(np.std([0.8, -0.5, 0.1, 0.6, 0.0]))
+        assert result["min_score"] == pytest.approx(-0.5)
+        assert result["max_score"] == pytest.approx(0.8)
+        assert result["positive_ratio"] == pytest.approx(0.4)
+        assert result["negative_ratio"] == pytest.approx(0.2)
+        assert result["neutral_ratio"] == pytest.approx(0.4)
+        assert result["article_count"] == 5
+        assert result["overall_label"] == "neutral"
+        assert all(type(v) in (float, int, str) for v in result.values())
+
+    def test_aggregated_sentiment_empty(self):
+        """Test aggregation without articles"""
+        result = SentimentAnalyzer.get_aggregated_sentiment([])
+        assert result["article_count"] == 0
+        assert result["overall_label"] == "neutral"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,128 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+from src.stock_scorer import StockScorer
+
+INFO = {
+    "longName": "Apple Inc.",
+    "sector": "Technology",
+    "industry": "Consumer Electronics",
+    "marketCap": 3000,
+    "currentPrice": 110.0,
+    "previousClose": 100.0,
+}
+
+
+class TestStockInfo:
+    """Test cached stock info lookups"""
+
+    @pytest.fixture
+    def scorer(self, tmp_path):
+        """Create StockScorer instance with an empty cache"""
+        return StockScorer(cache_dir=str(tmp_path))
+
+    @patch("src.stock_scorer.get_ticker")
+    def test_get_stock_info(self, mock_ticker, scorer):
+        """Test that one full info request fills both the static info and the quote"""
+        mock_ticker.return_value.info = INFO
+
+        info = scorer.get_stock_info("aapl")
+
+        assert info["company_name"] == "Apple Inc."
+        assert info["current_price"] == 110.0
+        assert info["day_change_percent"] == pytest.approx(10.0)
+        assert scorer.get_stock_info("AAPL") == info
+        assert mock_ticker.call_count == 1
+
+    @patch("src.stock_scorer.get_ticker")
+    def test_static_info_survives_restart(self, mock_ticker, scorer, tmp_path):
+        """Test that a new scorer reads company info from disk and only fetches the quote"""
+        mock_ticker.return_value.info = INFO
+        scorer.get_stock_info("AAPL")
+
+        mock_ticker.return_value.info = {}
+        mock_ticker.return_value.fast_info = {
+            "marketCap": 3300,
+            "lastPrice": 121.0,
+            "previousClose": 110.0,
+        }
+        info = StockScorer(cache_dir=str(tmp_path)).get_stock_info("AAPL")
+
+        assert info["sector"] == "Technology"
+        assert info["current_price"] == 121.0
+        assert info["day_change_percent"] == pytest.approx(10.0)
+
+    @patch("src.stock_scorer.get_ticker", side_effect=ConnectionError("offline"))
+    def test_get_stock_info_error(self, mock_ticker, scorer):
+        """Test the fallback when yfinance fails"""
+        info = scorer.get_stock_info("AAPL")
+
+        assert info == {
+            "ticker": "AAPL",
+            "company_name": "AAPL",
+            "sector": "Unknown",
+            "industry": "Unknown",
+        }
+
+
+class TestRecency:
+    """Test the recency score component"""
+
+    def test_recency_component(self):
+        """Test recency buckets, including unparseable dates"""
+        now = datetime.now(timezone.utc)
+        articles = [
+            {"published_at": (now - timedelta(hours=hours)).isoformat(timespec="seconds")}
+            for hours in (1, 30, 60, 200)
+        ]
+        articles += [{"published_at": "not a date"}, {"published_at": ""}, {}]
+
+        score = StockScorer(cache_dir=None)._calculate_recency_component(articles)
+
+        assert score == pytest.approx((0.5 + 0.2 + 0.0 - 0.2) / 7)
+
+    def test_recency_component_empty(self):
+        """Test that no articles give a neutral score"""
+        assert StockScorer(cache_dir=None)._calculate_recency_component([]) == 0.0
+
+
+class TestRecommendation:
+    """Test recommendation tiers"""
+
+    def test_recommendation_boundaries(self):
+        """Test that each tier starts at its threshold"""
+        scorer = StockScorer(cache_dir=None)
+        cases = {
+            0: "STRONG SELL",
+            29.9: "STRONG SELL",
+            30: "SELL",
+            40: "WEAK SELL",
+            45: "HOLD",
+            54.9: "HOLD",
+            55: "WEAK BUY",
+            60: "BUY",
+            70: "STRONG BUY",
+            100: "STRONG BUY",
+        }
+        for score, expected in cases.items():
+            assert scorer._generate_recommendation(score, {}) == expected
+
+
+class TestTopArticles:
+    """Test top article selection"""
+
+    def test_top_articles_by_magnitude(self):
+        """Test that the strongest sentiments are returned, in order"""
+        articles = [
+            {"title": t, "sentiment": {"score": score}, "sentiment_label": "neutral"}
+            for t, score in [("a", 0.1), ("b", -0.9), ("c", 0.5), ("d", 0.9), ("e", 0.0)]
+        ]
+
+        top = StockScorer(cache_dir=None)._get_top_articles(articles, n=3)
+
+        assert [a["title"] for a in top] == ["b", "d", "c"]
+        assert top[0]["sentiment_score"] == -0.9
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,63 @@
+import pytest
+from unittest.mock import Mock, patch
+
+pytest.importorskip("celery")
+
+from src import tasks  # noqa: E402
+
+ARTICLES = [{"title": "Apple shares surge", "description": "Record profit"}]
+
+
+class TestAnalyzeTask:
+    """Test the Celery analysis task body"""
+
+    @pytest.fixture
+    def pipeline(self):
+        """Worker pipeline components replaced by mocks"""
+        collector, analyzer, scorer = Mock(), Mock(), Mock()
+        collector.collect_all.return_value = ARTICLES
+        analyzer.analyze_articles.return_value = [{**ARTICLES[0], "sentiment": {"score": 0.5}}]
+        scorer.generate_report.return_value = {"ticker": "AAPL", "article_count": 1}
+        with patch.object(tasks, "_collector", collector), patch.object(
+            tasks, "_analyzer", analyzer
+        ), patch.object(tasks, "_scorer", scorer):
+            yield collector, analyzer, scorer
+
+    def test_report(self, pipeline):
+        """Test that the task runs collection, analysis and scoring and returns the report"""
+        collector, analyzer, scorer = pipeline
+
+        report = tasks.analyze_task("AAPL", days=3, max_articles=10)
+
+        assert report == {"ticker": "AAPL", "article_count": 1}
+        collector.collect_all.assert_called_once_with("AAPL", days=3, max_articles=10)
+        analyzer.analyze_articles.assert_called_once_with(ARTICLES)
+        assert scorer.generate_report.call_args.args[0] == "AAPL"
+        assert scorer.generate_report.call_args.args[2] == analyzer.analyze_articles.return_value
+
+    def test_no_articles(self, pipeline):
+        """Test that an empty news feed fails the task"""
+        collector, analyzer, _ = pipeline
+        collector.collect_all.return_value = []
+
+        with pytest.raises(ValueError, match="AAPL"):
+            tasks.analyze_task("AAPL")
+        analyzer.analyze_articles.assert_not_called()
+
+    @patch("src.tasks.StockScorer")
+    @patch("src.tasks.SentimentAnalyzer")
+    @patch("src.tasks.NewsCollector")
+    def test_initializes_worker(self, mock_collector, mock_analyzer, mock_scorer):
+        """Test that a task outside a prefork worker loads the pipeline first"""
+        mock_collector.return_value.collect_all.return_value = ARTICLES
+        with patch.object(tasks, "_collector", None), patch.object(
+            tasks, "_analyzer", None
+        ), patch.object(tasks, "_scorer", None):
+            tasks.analyze_task("AAPL")
+
+        mock_analyzer.return_value.warmup.assert_called_once()
+        mock_scorer.return_value.generate_report.assert_called_once()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,26 +1,67 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pytest
 from datetime import datetime
+from unittest.mock import patch
+from src import utils as src_utils
+from src.cache import FileCache
 from src.utils import (
     format_ticker,
     validate_ticker,
     get_date_range,
     clean_text,
+    clean_texts,
+    clean_texts_fast,
     calculate_sentiment_score,
+    calculate_sentiment_scores,
     get_sentiment_label,
+    get_sentiment_labels,
+    get_sentiment_codes,
     aggregate_sentiments,
+    aggregate_sentiments_grouped,
+    aggregate_sentiments_batch,
+    aggregate_sentiments_int8,
+    pack_scores,
+    unpack_scores,
+    STATS_DTYPE,
+    to_utc_isoformat,
+    save_json,
+    load_json,
+    MMAP_MIN_BYTES,
+    iter_json_items,
+    setup_logging,
+    validate_tickers,
+    validate_tickers_parallel,
+    _fetch_listed_tickers,
+    _ticker_memo,
+    _inflight,
+    _log_handlers,
 )
 
 
 class TestTickerFunctions:
     """Test ticker-related functions"""
 
+    @pytest.fixture(autouse=True)
+    def ticker_cache(self, tmp_path):
+        """Keep ticker lookups out of the real on-disk cache and off the network"""
+        _ticker_memo.clear()
+        cache = FileCache(str(tmp_path))
+        with patch("src.utils._ticker_cache", cache):
+            yield cache
+        _ticker_memo.clear()
+
     def test_format_ticker(self):
         """Test ticker formatting"""
         assert format_ticker("aapl") == "AAPL"
         assert format_ticker("  googl  ") == "GOOGL"
         assert format_ticker("MSFT") == "MSFT"
 
-    def test_validate_ticker(self):
+    @patch("src.utils._fetch_listed_tickers", return_value={"AAPL", "GOOGL", "A"})
+    def test_validate_ticker(self, mock_fetch):
         """Test ticker validation"""
         assert validate_ticker("AAPL") == True
         assert validate_ticker("GOOGL") == True
@@ -31,6 +72,142 @@ class TestTickerFunctions:
         assert validate_ticker("TOOLONG") == False
         assert validate_ticker("123") == False
         assert validate_ticker("AAP@") == False
+        assert validate_ticker("ZZZZ") == False
+
+    @patch("src.utils._fetch_listed_tickers")
+    def test_validate_ticker_cached(self, mock_fetch):
+        """Test that lookups are cached per ticker but failures are not"""
+        mock_fetch.return_value = {"ZZZZ"}
+
+        assert validate_ticker("zzzz") is True
+        assert validate_ticker("ZZZZ") is True
+        assert mock_fetch.call_count == 1
+
+        mock_fetch.side_effect = ConnectionError("offline")
+        assert validate_ticker("YYYY") is True
+        assert validate_ticker("YYYY") is True
+        assert mock_fetch.call_count == 3
+
+    @patch("src.utils._fetch_listed_tickers", return_value=set())
+    def test_validate_ticker_disk_cache(self, mock_fetch, ticker_cache):
+        """Test that lookups survive a process restart via the disk cache"""
+        assert validate_ticker("QQQQ") is False
+        assert ticker_cache.get("tickers", "QQQQ") == {"valid": False}
+
+        _ticker_memo.clear()
+        assert validate_ticker("QQQQ") is False
+        assert mock_fetch.call_count == 1
+
+    @patch("src.utils._fetch_listed_tickers", return_value=set())
+    def test_known_tickers_skip_lookup(self, mock_fetch):
+        """Test that S&P 500 symbols are valid without a network lookup"""
+        assert validate_tickers(["aapl", "MSFT", "JPM"]) == {
+            "aapl": True,
+            "MSFT": True,
+            "JPM": True,
+        }
+        mock_fetch.assert_not_called()
+
+        assert validate_ticker("ZZZZ") is False
+        assert mock_fetch.call_args.args[0] == ["ZZZZ"]
+
+    @patch("src.utils._fetch_listed_tickers")
+    def test_validate_tickers_batched(self, mock_fetch):
+        """Test that symbols are looked up 20 per request and results keep input keys"""
+        mock_fetch.side_effect = lambda chunk: set(chunk[::2])
+        symbols = ["QX" + "".join(chr(65 + (i // 26**k) % 26) for k in range(2)) for i in range(45)]
+
+        results = validate_tickers([s.lower() for s in symbols] + ["BAD1"])
+
+        assert [len(call.args[0]) for call in mock_fetch.call_args_list] == [20, 20, 5]
+        assert results["BAD1"] is False
+        assert results[symbols[0].lower()] is True
+        assert results[symbols[1].lower()] is False
+        assert len(results) == 46
+
+    @patch("src.utils._fetch_listed_tickers")
+    def test_validate_tickers_parallel(self, mock_fetch):
+        """Test that parallel validation matches sequential results"""
+        mock_fetch.side_effect = lambda chunk: {t for t in chunk if t.startswith("QX")}
+        symbols = ["QX" + "".join(chr(65 + (i // 26**k) % 26) for k in range(2)) for i in range(50)]
+        symbols += ["QZ" + symbol[2:] for symbol in symbols] + ["BAD1"]
+
+        results = validate_tickers_parallel(symbols, max_workers=4)
+
+        assert mock_fetch.call_count == 5  # the last batch only holds BAD1
+        assert results == {s: s.startswith("QX") for s in symbols}
+
+    @patch("src.utils._fetch_listed_tickers")
+    def test_concurrent_lookups_coalesced(self, mock_fetch):
+        """Test that concurrent validations of one symbol share a single lookup"""
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_fetch(chunk):
+            started.set()
+            release.wait(5)
+            return {"SLOW"}
+
+        mock_fetch.side_effect = slow_fetch
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            first = executor.submit(validate_ticker, "SLOW")
+            started.wait(5)
+            others = [executor.submit(validate_ticker, "slow") for _ in range(3)]
+            time.sleep(0.05)
+            release.set()
+            results = [first.result()] + [future.result() for future in others]
+
+        assert results == [True] * 4
+        assert mock_fetch.call_count == 1
+        assert not _inflight
+
+    def test_quote_request_uses_yfinance_session(self):
+        """Test that ticker lookups go through yfinance's shared YfData client"""
+        from yfinance.data import YfData
+
+        payload = {"quoteResponse": {"result": [{"symbol": "AAPL", "shortName": "Apple Inc."}]}}
+        with patch.object(YfData, "get_raw_json", return_value=payload) as mock_get:
+            assert _fetch_listed_tickers(["AAPL", "MSFT"]) == {"AAPL"}
+
+        mock_get.assert_called_once_with(src_utils._QUOTE_URL, params={"symbols": "AAPL,MSFT"})
+
+    @patch("yfinance.data.YfData")
+    def test_fetch_listed_tickers(self, mock_data):
+        """Test that only named securities in the quote response count as listed"""
+        mock_data.return_value.get_raw_json.return_value = {
+            "quoteResponse": {
+                "result": [
+                    {"symbol": "AAPL", "shortName": "Apple Inc."},
+                    {"symbol": "XYZQ"},
+                ]
+            }
+        }
+
+        assert _fetch_listed_tickers(["AAPL", "XYZQ", "NOPE"]) == {"AAPL"}
+        params = mock_data.return_value.get_raw_json.call_args.kwargs["params"]
+        assert params["symbols"] == "AAPL,XYZQ,NOPE"
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            {"finance": {"result": None, "error": {"code": "Unauthorized"}}},
+            {"quoteResponse": {"result": None, "error": None}},
+            {"quoteResponse": {"result": [], "error": {"code": "Too Many Requests"}}},
+        ],
+    )
+    @patch("yfinance.data.YfData")
+    def test_quote_error_not_cached(self, mock_data, payload, ticker_cache):
+        """Test that error payloads fail open instead of caching symbols as invalid"""
+        mock_data.return_value.get_raw_json.return_value = payload
+
+        with pytest.raises(ValueError):
+            _fetch_listed_tickers(["ZZZQ"])
+        assert validate_ticker("ZZZQ") is True
+        assert ticker_cache.get("tickers", "ZZZQ") is None
+
+
+# Fixed clock for date tests, so they don't depend on when they run
+NOW = datetime(2024, 3, 4, 23, 59, 59)
 
 
 class TestDateFunctions:
@@ -38,7 +215,7 @@ class TestDateFunctions:
 
     def test_get_date_range(self):
         """Test date range generation"""
-        start, end = get_date_range(days=7)
+        start, end = get_date_range(days=7, now=NOW)
 
         # Check format
         assert len(start) == 10  # YYYY-MM-DD
@@ -54,8 +231,8 @@ class TestDateFunctions:
 
     def test_get_date_range_different_days(self):
         """Test with different day values"""
-        start1, end1 = get_date_range(days=1)
-        start30, end30 = get_date_range(days=30)
+        start1, end1 = get_date_range(days=1, now=NOW)
+        start30, end30 = get_date_range(days=30, now=NOW)
 
         diff1 = (datetime.strptime(end1, "%Y-%m-%d") - datetime.strptime(start1, "%Y-%m-%d")).days
         diff30 = (
@@ -65,6 +242,20 @@ class TestDateFunctions:
         assert diff1 == 1
         assert diff30 == 30
 
+    def test_get_date_range_fixed_now(self):
+        """Test exact dates across a month boundary in a leap year"""
+        assert get_date_range(days=7, now=NOW) == ("2024-02-26", "2024-03-04")
+
+    def test_to_utc_isoformat(self):
+        """Test timestamp normalization to UTC ISO strings"""
+        expected = "2024-01-01T12:00:00+00:00"
+        assert to_utc_isoformat("2024-01-01T12:00:00Z") == expected
+        assert to_utc_isoformat("2024-01-01T14:00:00+02:00") == expected
+        assert to_utc_isoformat("2024-01-01T12:00:00") == expected
+        assert to_utc_isoformat(1704110400) == expected
+        assert to_utc_isoformat("") == ""
+        assert to_utc_isoformat(None) == ""
+
 
 class TestTextCleaning:
     """Test text processing functions"""
@@ -87,6 +278,46 @@ class TestTextCleaning:
         cleaned = clean_text(text)
         assert cleaned == "Hello, world! How are you?"
 
+    def test_clean_text_urls(self):
+        """Test that URLs are removed"""
+        text = "Apple beats estimates https://example.com/a?b=1 \n read more at http://x.co"
+        assert clean_text(text) == "Apple beats estimates read more at"
+
+    def test_clean_texts(self):
+        """Test that batch cleaning matches clean_text"""
+        texts = ["  hello   world  ", "", None, "Beats https://example.com/a  estimates\n"]
+        assert clean_texts(texts) == [clean_text(text) for text in texts]
+
+    def test_clean_texts_fast(self):
+        """Test that the Hyperscan path (or its fallback) matches clean_texts"""
+        texts = [
+            "  hello   world  ",
+            "",
+            None,
+            "See http://a.co/http://b.co and https://x.io/p?q=1\u00a0now",
+            "Price target \u20ac200 https://example.com/a\n",
+            "Scraped \ud83d text https://example.com/b",
+        ]
+        assert clean_texts_fast(texts) == clean_texts(texts)
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "no links here",
+            "Read https://example.com/a now",
+            "See http://a.co/http://b.co and https://x.io/p?q=1\u00a0now",
+            "Adjacent http://a.cohttps://b.co end",
+            "Two http://a.co http://b.co  apart",
+            "xhttp://a.co at start and end http://",
+            "Caf\u00e9 \u20ac200 https://example.com/\u00e9t\u00e9 \u65e5\u672c",
+            "Lone \ud800 surrogate https://example.com/c",
+        ],
+    )
+    def test_strip_urls_hyperscan(self, text):
+        """Test that the Hyperscan scan removes exactly what the regex removes"""
+        pytest.importorskip("hyperscan")
+        assert src_utils._strip_urls_hyperscan(text) == src_utils._URL_RE.sub("", text)
+
 
 class TestSentimentFunctions:
     """Test sentiment calculation functions"""
@@ -105,6 +336,17 @@ class TestSentimentFunctions:
         score = calculate_sentiment_score(0.3, 0.3, 0.4)
         assert score == pytest.approx(0.0)
 
+    def test_calculate_sentiment_scores(self):
+        """Test that batch scores match the scalar calculation"""
+        positive = np.array([0.8, 0.1, 0.3], dtype=np.float32)
+        negative = np.array([0.1, 0.8, 0.3], dtype=np.float32)
+
+        scores = calculate_sentiment_scores(positive, negative)
+
+        assert scores.dtype == np.float32
+        assert scores.flags["C_CONTIGUOUS"]
+        assert scores.tolist() == pytest.approx([0.7, -0.7, 0.0])
+
     def test_get_sentiment_label(self):
         """Test sentiment label generation"""
         assert get_sentiment_label(0.5) == "bullish"
@@ -116,6 +358,18 @@ class TestSentimentFunctions:
         assert get_sentiment_label(0.2, threshold=0.1) == "bullish"
         assert get_sentiment_label(-0.2, threshold=0.1) == "bearish"
 
+    def test_get_sentiment_labels(self):
+        """Test that batch labels and codes match the scalar labels"""
+        scores = [0.5, -0.5, 0.0, 0.2, 0.3, -0.3, 0.31]
+
+        codes = get_sentiment_codes(scores)
+
+        assert codes.dtype == np.int8
+        assert codes.tolist() == [1, -1, 0, 0, 0, 0, 1]
+        assert get_sentiment_labels(scores) == [get_sentiment_label(s) for s in scores]
+        assert get_sentiment_labels(np.array([0.2]), threshold=0.1) == ["bullish"]
+        assert get_sentiment_labels([]) == []
+
     def test_aggregate_sentiments(self):
         """Test sentiment aggregation"""
         sentiments = [0.5, 0.3, -0.2, 0.8, -0.1]
@@ -126,6 +380,66 @@ class TestSentimentFunctions:
         assert "std" in result
         assert result["count"] == 5
         assert -1 <= result["mean"] <= 1
+        assert result["median"] == 0.3
+        assert result["std"] == pytest.approx(np.std(sentiments, ddof=1))
+        assert (result["min"], result["max"]) == (-0.2, 0.8)
+
+    def test_aggregate_sentiments_grouped(self):
+        """Test that grouped statistics match aggregate_sentiments per group"""
+        tickers = np.array(["MSFT", "AAPL", "MSFT", "AAPL", "TSLA", "MSFT", "AAPL"])
+        scores = np.array([0.5, -0.2, 0.1, 0.9, -0.4, -0.3, 0.3])
+
+        result = aggregate_sentiments_grouped(scores, tickers)
+
+        assert list(result) == ["AAPL", "MSFT", "TSLA"]
+        for ticker, stats in result.items():
+            expected = aggregate_sentiments(scores[tickers == ticker].tolist())
+            assert stats == pytest.approx(expected)
+        assert aggregate_sentiments_grouped(np.array([]), np.array([])) == {}
+
+    def test_aggregate_sentiments_batch(self):
+        """Test that batch rows match aggregate_sentiments, including empty lists"""
+        batches = [[0.5, 0.3, -0.2, 0.8, -0.1], [], [0.4], [-0.9, 0.1]]
+
+        stats = aggregate_sentiments_batch(batches)
+
+        assert stats.dtype == STATS_DTYPE
+        assert stats.itemsize == 24
+        for row, batch in zip(stats, batches):
+            expected = aggregate_sentiments(batch)
+            assert {name: row[name].item() for name in STATS_DTYPE.names} == pytest.approx(
+                expected, abs=1e-6
+            )
+        assert aggregate_sentiments_batch([[], []])["count"].tolist() == [0, 0]
+
+    def test_pack_scores(self):
+        """Test int8 quantization and the round trip back to floats"""
+        scores = np.array([1.0, -1.0, 0.0, 0.5, -0.333, 1.7])
+
+        packed = pack_scores(scores)
+
+        assert packed.dtype == np.int8
+        assert packed.tolist() == [127, -127, 0, 64, -42, 127]
+        assert np.abs(unpack_scores(packed) - np.clip(scores, -1, 1)).max() <= 1 / 254 + 1e-7
+
+    def test_aggregate_sentiments_int8(self):
+        """Test that int8 aggregation matches the float path within quantization error"""
+        sentiments = [0.5, 0.3, -0.2, 0.8, -0.1, 0.05]
+
+        result = aggregate_sentiments_int8(pack_scores(sentiments))
+        expected = aggregate_sentiments(sentiments)
+
+        assert result["count"] == expected["count"]
+        assert result == pytest.approx(expected, abs=1 / 127)
+        assert aggregate_sentiments_int8(pack_scores([]))["count"] == 0
+        assert aggregate_sentiments_int8(pack_scores([0.4]))["std"] == 0.0
+
+    def test_aggregate_sentiments_single(self):
+        """Test that a single score has zero spread"""
+        result = aggregate_sentiments([0.4])
+
+        assert result["std"] == 0.0
+        assert result["mean"] == result["median"] == 0.4
 
     def test_aggregate_sentiments_empty(self):
         """Test aggregation with empty list"""
@@ -154,5 +468,96 @@ class TestEdgeCases:
         assert score == -1.0
 
 
+class TestLogging:
+    """Test logging setup"""
+
+    def test_setup_logging_idempotent(self, tmp_path, monkeypatch):
+        """Test that repeated setup doesn't add handlers but updates the level"""
+        monkeypatch.chdir(tmp_path)
+        root = logging.getLogger()
+        handlers_before, level_before = list(root.handlers), root.level
+
+        try:
+            setup_logging("INFO")
+            added = [h for h in root.handlers if h not in handlers_before]
+            setup_logging("DEBUG")
+
+            assert len(added) == 2
+            assert [h for h in root.handlers if h not in handlers_before] == added
+            assert root.level == logging.DEBUG
+            assert not (tmp_path / "logs").exists()  # the log file is opened on first record
+        finally:
+            for handler in _log_handlers:
+                root.removeHandler(handler)
+                handler.close()
+            _log_handlers.clear()
+            root.setLevel(level_before)
+
+
+class TestJsonFiles:
+    """Test JSON file helpers"""
+
+    def test_save_and_load_json(self, tmp_path):
+        """Test a round trip with unicode, numpy values and an overwrite"""
+        filepath = str(tmp_path / "report.json")
+        data = {"ticker": "AAPL", "title": "Café €", "score": np.float64(0.25), 1: "int key"}
+
+        save_json({"old": True}, filepath)
+        save_json(data, filepath)
+
+        assert load_json(filepath) == {
+            "ticker": "AAPL",
+            "title": "Café €",
+            "score": 0.25,
+            "1": "int key",
+        }
+        assert [p.name for p in tmp_path.iterdir()] == ["report.json"]
+
+    def test_load_large_json(self, tmp_path):
+        """Test that files above the mmap threshold load the same way"""
+        filepath = str(tmp_path / "news.json")
+        data = {"articles": [{"title": f"Story {i}", "score": i / 1000} for i in range(5000)]}
+        save_json(data, filepath)
+
+        assert (tmp_path / "news.json").stat().st_size >= MMAP_MIN_BYTES
+        assert load_json(filepath) == data
+
+    def test_save_json_skips_unchanged(self, tmp_path):
+        """Test that saving identical content does not rewrite the file"""
+        filepath = str(tmp_path / "report.json")
+        save_json({"ticker": "AAPL"}, filepath)
+
+        with patch("src.utils.os.replace") as mock_replace:
+            save_json({"ticker": "AAPL"}, filepath)
+            mock_replace.assert_not_called()
+
+            save_json({"ticker": "MSFT"}, filepath)
+            mock_replace.assert_called_once()
+
+    def test_save_json_file_mode(self, tmp_path):
+        """Test that new files get the same mode as open() and rewrites keep the existing mode"""
+        plain = tmp_path / "plain.json"
+        plain.write_text("{}")
+        filepath = tmp_path / "report.json"
+        save_json({"ticker": "AAPL"}, str(filepath))
+        assert filepath.stat().st_mode & 0o777 == plain.stat().st_mode & 0o777
+
+        filepath.chmod(0o640)
+        save_json({"ticker": "MSFT"}, str(filepath))
+        assert filepath.stat().st_mode & 0o777 == 0o640
+
+    @pytest.mark.parametrize("use_ijson", [True, False])
+    def test_iter_json_items(self, tmp_path, use_ijson):
+        """Test streaming records by prefix, with and without ijson"""
+        filepath = str(tmp_path / "news.json")
+        articles = [{"title": "A", "score": 0.5}, {"title": "B", "score": -0.25}]
+        save_json({"ticker": "AAPL", "articles": articles}, filepath)
+
+        with patch("src.utils.ijson", src_utils.ijson if use_ijson else None):
+            assert list(iter_json_items(filepath, "articles.item")) == articles
+            assert list(iter_json_items(filepath, "ticker")) == ["AAPL"]
+            assert list(iter_json_items(filepath, "missing.item")) == []
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,38 @@
+import pytest
+from unittest.mock import patch
+
+from src import yf_pool
+from src.yf_pool import clear_tickers, get_ticker
+
+
+class TestGetTicker:
+    """Test cases for the shared yfinance Ticker pool"""
+
+    @pytest.fixture(autouse=True)
+    def empty_pool(self):
+        """Start and end each test with an empty pool"""
+        clear_tickers()
+        yield
+        clear_tickers()
+
+    @patch("src.yf_pool.yf.Ticker")
+    def test_reuses_ticker(self, mock_ticker):
+        """Test that repeated lookups share one Ticker instance"""
+        assert get_ticker("AAPL") is get_ticker("AAPL")
+        mock_ticker.assert_called_once_with("AAPL")
+
+    @patch("src.yf_pool.yf.Ticker")
+    def test_separate_symbols(self, mock_ticker):
+        """Test that each symbol gets its own Ticker"""
+        get_ticker("AAPL")
+        get_ticker("MSFT")
+        assert mock_ticker.call_count == 2
+
+    @patch("src.yf_pool.yf.Ticker")
+    def test_clear_tickers(self, mock_ticker):
+        """Test that clearing the pool recreates Ticker objects"""
+        get_ticker("AAPL")
+        clear_tickers()
+        get_ticker("AAPL")
+        assert mock_ticker.call_count == 2
+        assert len(yf_pool._tickers) == 1